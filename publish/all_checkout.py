@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+checkout article published for base, zenn and qiita.
+copyright 2026, hanagai
+
+all_checkout.py
+version: October 18, 2026
+"""
+
+import argparse
+from conf import *
+from base_checkout import BaseCheckout
+from zenn_checkout import ZennCheckout
+from qiita_checkout import QiitaCheckout
+from common_parallel import print_results
+from common_async import run_jobs
+
+
+def main():
+    print('main launched manually.')
+    description = 'checkout article published for base, zenn and qiita.'
+    arg_key = 'key to checkout; 70525_publish_zenn_qiita'
+    arg_dry = 'disable changes (optional)'
+    arg_parallel = 'checkout base, zenn and qiita at once (optional)'
+    myself = 'all_checkout.py'
+
+    f"""
+    purpose:
+        {description}
+
+    usage:
+        ./{myself} 70525_publish_zenn_qiita
+        ./{myself} 70525_publish_zenn_qiita --dry
+        ./{myself} 70525_publish_zenn_qiita --parallel
+
+    arguments:
+        1st: {arg_key}
+        -d: {arg_dry}
+        -p: {arg_parallel}
+    """
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('key', help=arg_key)
+    parser.add_argument('-d', '--dry', help=arg_dry, default=False, action='store_true')
+    parser.add_argument('-p', '--parallel', help=arg_parallel, default=False, action='store_true')
+    args = parser.parse_args()
+
+    print(args)
+
+    targets = {
+        'base': (BaseCheckout, conf_dirs.BASE),
+        'zenn': (ZennCheckout, conf_dirs.ZENN),
+        'qiita': (QiitaCheckout, conf_dirs.QIITA),
+    }
+    if args.parallel:
+        # current is shared, write it once before checkouts
+        BaseCheckout(dry_run=args.dry).set_current(args.key)
+        jobs = [(name, path, lambda cls=cls: cls(dry_run=args.dry).checkout(args.key)) for name, (cls, path) in targets.items()]
+        results = run_jobs(jobs)
+        print_results(results)
+        if not all(result.ok for result in results):
+            raise SystemExit(1)
+    else:
+        for cls, path in targets.values():
+            cls(dry_run=args.dry).checkout(args.key)
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,7 @@ publish current article file for base, zenn and qiita.
 copyright 2025, hanagai
 
 all_publish.py
-version: May 30, 2025
+version: October 18, 2026
 """
 
 import argparse
@@ -14,6 +14,8 @@ from conf import *
 from base_publish import BasePublish
 from zenn_publish import ZennPublish
 from qiita_publish import QiitaPublish
+from common_parallel import print_results
+from common_async import run_jobs
 
 
 def main():
@@ -22,6 +24,7 @@ def main():
     arg_dry = 'disable git writing (optional)'
     arg_nomerge = 'disable merging pull request (optional)'
     arg_ignore = 'ignore uncommitted changes (optional)'
+    arg_parallel = 'publish base, zenn and qiita at once (optional)'
     myself = 'all_publish.py'
 
     f"""
@@ -33,23 +36,38 @@ def main():
         ./{myself} --dry
         ./{myself} --nomerge
         ./{myself} --ignore
+        ./{myself} --parallel
 
     arguments:
         -d: {arg_dry}
         -n: {arg_nomerge}
         -i: {arg_ignore}
+        -p: {arg_parallel}
     """
 
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument('-d', '--dry', help=arg_dry, default=False, action='store_true')
     parser.add_argument('-n', '--nomerge', help=arg_nomerge, default=False, action='store_true')
     parser.add_argument('-i', '--ignore', help=arg_ignore, default=False, action='store_true')
+    parser.add_argument('-p', '--parallel', help=arg_parallel, default=False, action='store_true')
     args = parser.parse_args()
 
     print(args)
 
-    for cls in [BasePublish, ZennPublish, QiitaPublish]:
-        cls(dry_run=args.dry, no_merge=args.nomerge, ignore_uncommitted_change=args.ignore).publish()
+    targets = {
+        'base': (BasePublish, conf_dirs.BASE),
+        'zenn': (ZennPublish, conf_dirs.ZENN),
+        'qiita': (QiitaPublish, conf_dirs.QIITA),
+    }
+    if args.parallel:
+        jobs = [(name, path, cls(dry_run=args.dry, no_merge=args.nomerge, ignore_uncommitted_change=args.ignore).publish) for name, (cls, path) in targets.items()]
+        results = run_jobs(jobs)
+        print_results(results)
+        if not all(result.ok for result in results):
+            raise SystemExit(1)
+    else:
+        for cls, path in targets.values():
+            cls(dry_run=args.dry, no_merge=args.nomerge, ignore_uncommitted_change=args.ignore).publish()
 
 if __name__ == '__main__':
     main()
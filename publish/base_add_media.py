@@ -6,7 +6,7 @@ copy and git add pictures.
 copyright 2025, hanagai
 
 base_add_media.py
-version: June 1, 2025
+version: October 18, 2026
 """
 
 import argparse
@@ -15,6 +15,7 @@ import re
 import os.path
 import shutil
 from conf import *
+import common_trace
 from common_run import Run
 from base_git import BaseGit
 
@@ -54,28 +55,30 @@ def copy_file(dry_run, file, dest_file):
     else:
       shutil.copy(file, dest_file)
 
-def git_add(dry_run, dest_file, git):
+def git_add(dry_run, dest_files, git):
   r"""
-  git add
+  git add all files at once
   """
-  print(f' - {md_link(dest_file, git)}')
+  for dest_file in dest_files:
+    print(f' - {md_link(dest_file, git)}')
   if dry_run:
-    print(f'DRY-RUN: not git add {relative_path(dest_file)}')
+    print(f'DRY-RUN: not git add {[relative_path(dest_file) for dest_file in dest_files]}')
   else:
-    git.git_add(dest_file)
+    git.git_add_files(dest_files)
 
-def add_media_a_file(dry_run, file, git):
+def add_media_a_file(dry_run, file):
   r"""
-  copy and git add a picture file.
+  copy a picture file, return the destination.
   """
   dest_file = new_media_name(file)
   copy_file(dry_run, file, dest_file)
-  git_add(dry_run, dest_file, git)
+  return dest_file
 
 def notify(message):
   r"""
   notify message
   """
+  common_trace.phase(os.path.basename(__file__), message)
   now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
   doc = re.sub(r'\n', '\n-   ', __doc__)
   print(f'''---
@@ -93,8 +96,8 @@ def add_media_files(args):
   files = args['files']
   git = BaseGit(skip_initialize=dry_run)
 
-  for file in files:
-    add_media_a_file(dry_run, os.path.abspath(file), git)
+  dest_files = [add_media_a_file(dry_run, os.path.abspath(file)) for file in files]
+  git_add(dry_run, dest_files, git)
 
   notify('Done')
 
@@ -6,7 +6,7 @@ create a new document files at base-doc.
 copyright 2025, hanagai
 
 base_init.py
-version: May 27, 2025
+version: October 18, 2026
 """
 
 import argparse
@@ -14,6 +14,7 @@ import os
 import datetime
 import re
 from conf import *
+import common_trace
 from base_git import BaseGit
 
 DRY_RUN = False # disable file writing yaml and md if True
@@ -61,14 +62,16 @@ def set_current(args):
     r"""
     set current series, name
     """
-    conf_current.set_current('now', args['date'])
-    conf_current.set_current('series', args['series'])
-    conf_current.set_current('name', args['name'])
-    conf_current.set_current('key', f"{args['date']}_{args['name']}")
-
-def write_yaml(args, git):
+    conf_current.set_currents({
+        'now': args['date'],
+        'series': args['series'],
+        'name': args['name'],
+        'key': f"{args['date']}_{args['name']}",
+    })
+
+def write_yaml(args):
     r"""
-    write yaml file and git add
+    write yaml file, return path to git add
     """
     path = conf_current.meta_path()
     os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -80,11 +83,11 @@ def write_yaml(args, git):
     else:
         with open(path, 'w') as f:
             f.write(yaml)
-        git.git_add(path)
+        return path
 
-def write_md(args, git):
+def write_md(args):
     r"""
-    write md file and git add
+    write md file, return path to git add
     """
     path = conf_current.a_path()
     os.makedirs(os.path.dirname(path), exist_ok=True)
@@ -96,11 +99,11 @@ def write_md(args, git):
     else:
         with open(path, 'w') as f:
             f.write(md)
-        git.git_add(path)
+        return path
 
-def modify_readme(args, git):
+def modify_readme(args):
     r"""
-    modify README.md file and git add
+    modify README.md file, return path to git add
     """
     path = conf_current.readme_path()
     print(f'\nreadme path: {path}')
@@ -127,7 +130,7 @@ def modify_readme(args, git):
     else:
         with open(path, 'w') as f:
             f.writelines(lines)
-        git.git_add(path)
+        return path
 
 def commit_and_push(git):
     r"""
@@ -143,6 +146,7 @@ def notify(message):
     r"""
     notify message
     """
+    common_trace.phase(os.path.basename(__file__), message)
     now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     doc = re.sub(r'\n', '\n-   ', __doc__)
     print(f'''---
@@ -159,9 +163,9 @@ def make_initial_documents(args):
 
     set_current(args)
     git = BaseGit(skip_initialize=DRY_RUN)
-    write_yaml(args, git)
-    write_md(args, git)
-    modify_readme(args, git)
+    paths = [write_yaml(args), write_md(args), modify_readme(args)]
+    if not DRY_RUN:
+        git.git_add_files([path for path in paths if path is not None])
     commit_and_push(git)
 
     notify('Done')
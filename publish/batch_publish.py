@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+update and publish many articles, each in its own git worktrees.
+copyright 2026, hanagai
+
+batch_publish.py
+version: October 18, 2026
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import os.path
+import shutil
+import sys
+import time
+from conf import *
+from common_async import Scheduler, max_parallel_default
+from common_checkout import CommonCheckout
+from base_git import BaseGit
+from zenn_git import ZennGit
+from qiita_git import QiitaGit
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKTREES = os.path.join(conf_dirs.TMP, 'worktrees')
+GITS = [BaseGit, ZennGit, QiitaGit]
+REPOS = [conf_dirs.BASE, conf_dirs.ZENN, conf_dirs.QIITA]
+
+OK = 'OK'
+SKIP = 'SKIP'
+FAILED = 'FAILED'
+
+class KeyResult:
+    r"""
+    result of a key in batch
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.status = None
+        self.reason = ''
+        self.elapsed = 0.0
+        self.log = None
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.key},'
+            f'{self.status},'
+            f'{self.reason},'
+            f')'
+        )
+
+def select_keys(keys, tags, series):
+    r"""
+    keys given, or keys of articles having all tags in series
+    """
+    if keys:
+        return keys
+    selected = []
+    for entry in conf_current.meta_index().entries():
+        if tags and not set(tags) <= set(entry['tags']):
+            continue
+        if series and entry['series'] not in series:
+            continue
+        selected.append(entry['key'])
+    return sorted(set(selected))
+
+def worktree_home(key):
+    r"""
+    DOC_HOME of a key, repositories under the same account directory name
+    """
+    return os.path.join(WORKTREES, key, os.path.basename(conf_dirs.DOC_HOME))
+
+async def worktree_branches(scheduler, repo):
+    r"""
+    branches checked out by any worktree of the repository
+    """
+    result = await scheduler.run(repo, ['git', 'worktree', 'list', '--porcelain'])
+    prefix = 'branch refs/heads/'
+    return {line[len(prefix):] for line in result.stdout.splitlines() if line.startswith(prefix)}
+
+async def fetch_mains(scheduler):
+    r"""
+    fetch remote main of each repository once, local main may be behind.
+    return {repository: oid}
+    """
+    mains = {}
+    for cls, repo in zip(GITS, REPOS):
+        git = cls(skip_initialize=True)
+        result = await scheduler.run(repo, ['git', 'fetch', '-q', git.repo_url(), git.main_branch()])
+        if result.returncode != 0:
+            raise RuntimeError(f'Error: git fetch {git.repo_name()}: {result.stderr.strip()}')
+        mains[repo] = (await scheduler.run(repo, ['git', 'rev-parse', 'FETCH_HEAD'])).stdout.strip()
+    return mains
+
+async def add_worktrees(scheduler, key, home, mains):
+    r"""
+    add a detached worktree at remote main for each repository.
+    return reason to skip, or None
+    """
+    for repo in REPOS:
+        if key in await worktree_branches(scheduler, repo):
+            return f'{key} is checked out in a worktree of {os.path.basename(repo)}'
+    for repo in REPOS:
+        path = os.path.join(home, os.path.basename(repo))
+        if os.path.exists(path):
+            return f'worktree exists: {path}'
+        result = await scheduler.run(repo, ['git', 'worktree', 'add', '--detach', path, mains[repo]])
+        if result.returncode != 0:
+            raise RuntimeError(f'Error: git worktree add {path}: {result.stderr.strip()}')
+    return None
+
+async def remote_branches(scheduler, key):
+    r"""
+    {repository: True if the branch of the key exists on remote}
+    """
+    found = {}
+    for cls, repo in zip(GITS, REPOS):
+        git = cls(skip_initialize=True)
+        result = await scheduler.run(repo, ['git', 'ls-remote', '--heads', git.repo_url(), f'refs/heads/{key}'])
+        if result.returncode != 0:
+            raise RuntimeError(f'Error: git ls-remote {git.repo_name()}: {result.stderr.strip()}')
+        found[repo] = result.stdout.strip() != ''
+    return found
+
+async def delete_unpublished(scheduler, key, before):
+    r"""
+    delete remote branches of the key pushed by this batch, but not published
+    """
+    after = await remote_branches(scheduler, key)
+    for cls, repo in zip(GITS, REPOS):
+        if not after[repo] or before[repo]:
+            continue
+        git = cls(skip_initialize=True)
+        result = await scheduler.run(repo, ['git', 'push', '-q', git.repo_url(), '--delete', key])
+        if result.returncode != 0:
+            print(f'Error: git push --delete {git.repo_name()}:{key}: {result.stderr.strip()}')
+        else:
+            print(f'deleted remote branch not published: {git.repo_name()}:{key}')
+
+async def remove_worktrees(scheduler, home):
+    r"""
+    remove worktrees of the home, then the home itself
+    """
+    for repo in REPOS:
+        path = os.path.join(home, os.path.basename(repo))
+        if os.path.exists(path):
+            await scheduler.run(repo, ['git', 'worktree', 'remove', '--force', path])
+    shutil.rmtree(os.path.dirname(home), ignore_errors=True)
+
+def write_current(home, values):
+    r"""
+    current settings of the worktree home, same format as conf_current
+    """
+    tmp = os.path.join(home, os.path.basename(conf_dirs.TOOL), 'tmp')
+    state = {'version': conf_current.STATE_VERSION, 'current': values}
+    conf_current.write_atomic(os.path.join(tmp, 'current.json'), json.dumps(state, ensure_ascii=False, indent=2) + '\n')
+
+def nolook_command(args):
+    command = [sys.executable, os.path.join(TOOL_DIR, 'nolook_publish.py'), '--publish']
+    if args.dry:
+        command.append('--dry')
+    if args.nomerge:
+        command.append('--nomerge')
+    return command
+
+def classify(done):
+    r"""
+    status and reason from output of nolook_publish.
+    commands failing inside print Error: and go on, so the output is checked too
+    """
+    errors = [line.strip() for line in done.stdout.splitlines() if line.strip().startswith('Error:')]
+    if done.returncode != 0:
+        lines = done.stderr.strip().splitlines()
+        return FAILED, lines[-1] if lines else f'exit {done.returncode}'
+    if errors:
+        return FAILED, errors[0]
+    if done.stdout.count('SKIP: no branch found') >= len(REPOS):
+        return SKIP, 'nothing to publish'
+    return OK, ''
+
+async def publish_key(scheduler, key, current, mains, args):
+    r"""
+    update and publish a key in its own worktrees
+    """
+    result = KeyResult(key)
+    home = worktree_home(key)
+    result.log = os.path.join(WORKTREES, f'{key}.log')
+    start = time.perf_counter()
+    try:
+        reason = await add_worktrees(scheduler, key, home, mains)
+        if reason is not None:
+            result.status, result.reason = SKIP, reason
+            return result
+        write_current(home, current)
+        env = dict(os.environ)
+        env[conf_dirs.DOC_HOME_ENV] = home
+        env[conf_current.MANIFEST_ENV] = conf_current.MANIFEST
+        base = os.path.join(home, os.path.basename(conf_dirs.BASE))
+        before = None if args.dry else await remote_branches(scheduler, key)
+        done = await scheduler.run(base, nolook_command(args), env=env)
+        with open(result.log, 'w') as f:
+            f.write(done.stdout)
+            f.write(done.stderr)
+        result.status, result.reason = classify(done)
+        if result.status != OK and before is not None:
+            await delete_unpublished(scheduler, key, before)
+    except Exception as e:
+        result.status, result.reason = FAILED, repr(e)
+    finally:
+        if not args.keep:
+            await remove_worktrees(scheduler, home)
+        result.elapsed = time.perf_counter() - start
+        print(f'{result.status:6} {key} {result.elapsed:.1f}s {result.reason}')
+    return result
+
+def batch_publish(keys, args):
+    r"""
+    publish keys by a bounded pool of workers
+    """
+    currents = {}
+    results = []
+    for key in keys:
+        try:
+            currents[key] = CommonCheckout(dry_run=True).new_current(key)
+        except RuntimeError:
+            result = KeyResult(key)
+            result.status, result.reason = FAILED, 'not found in meta yaml'
+            results.append(result)
+    # worktree commands on a repository run one by one, nolook runs on its own worktree
+    scheduler = Scheduler(args.jobs)
+    pending = [key for key in keys if key in currents]
+
+    async def run_all():
+        workers = asyncio.Semaphore(args.jobs)
+        mains = await fetch_mains(scheduler)
+
+        async def bounded(key):
+            async with workers:
+                return await publish_key(scheduler, key, currents[key], mains, args)
+
+        done = await asyncio.gather(*(bounded(key) for key in pending))
+        for repo in REPOS:
+            await scheduler.run(repo, ['git', 'worktree', 'prune'])
+        return done
+
+    os.makedirs(WORKTREES, exist_ok=True)
+    results.extend(asyncio.run(run_all()))
+    return results
+
+def print_summary(results):
+    r"""
+    print summary of successes, skips and failures
+    """
+    print('=== summary ===')
+    for status in [OK, SKIP, FAILED]:
+        matched = [result for result in results if result.status == status]
+        print(f'{status}: {len(matched)}')
+        for result in matched:
+            log = f' (log: {result.log})' if status == FAILED and result.log and os.path.exists(result.log) else ''
+            print(f'  {result.key:36} {result.elapsed:6.1f}s {result.reason}{log}')
+    print('======')
+
+def main():
+    print('main launched manually.')
+    description = 'update and publish many articles, each in its own git worktrees.'
+    arg_keys = 'keys to publish (optional)'
+    arg_tags = 'publish articles having all of the tags (optional)'
+    arg_series = 'publish articles in the series (optional)'
+    arg_jobs = 'number of articles at once (optional)'
+    arg_dry = 'disable git writing (optional)'
+    arg_nomerge = 'disable merging pull request (optional)'
+    arg_keep = 'keep worktrees after publish (optional)'
+    arg_list = 'list keys selected and exit (optional)'
+    myself = 'batch_publish.py'
+
+    f"""
+    purpose:
+        {description}
+
+    usage:
+        ./{myself} -k 70525_publish_zenn_qiita 70530_x1
+        ./{myself} --tags Android --series a b
+        ./{myself} --series a --list
+        ./{myself} --series a -j 4 --nomerge
+
+    arguments:
+        -k: {arg_keys}
+        --tags: {arg_tags}
+        --series: {arg_series}
+        -j: {arg_jobs}
+        -d: {arg_dry}
+        -n: {arg_nomerge}
+        --keep: {arg_keep}
+        --list: {arg_list}
+    """
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-k', '--keys', help=arg_keys, nargs='+', default=[])
+    parser.add_argument('--tags', help=arg_tags, nargs='+', default=[])
+    parser.add_argument('--series', help=arg_series, nargs='+', default=[])
+    parser.add_argument('-j', '--jobs', help=arg_jobs, default=max_parallel_default(), type=int)
+    parser.add_argument('-d', '--dry', help=arg_dry, default=False, action='store_true')
+    parser.add_argument('-n', '--nomerge', help=arg_nomerge, default=False, action='store_true')
+    parser.add_argument('--keep', help=arg_keep, default=False, action='store_true')
+    parser.add_argument('--list', help=arg_list, default=False, action='store_true')
+    args = parser.parse_args()
+
+    print(args)
+    if not (args.keys or args.tags or args.series):
+        print('No keys, tags or series specified. Exiting.')
+        return
+
+    keys = select_keys(args.keys, args.tags, args.series)
+    print(f'{len(keys)} keys selected')
+    if args.list:
+        for key in keys:
+            print(key)
+        return
+
+    results = batch_publish(keys, args)
+    print_summary(results)
+    if any(result.status == FAILED for result in results):
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+benchmark entry points on synthetic corpora of growing size.
+copyright 2026, hanagai
+
+bench_all.py
+version: October 18, 2026
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import os.path
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from conf import *
+from common_run import Run
+import bench_corpus
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_DIR = os.path.join(TOOL_DIR, 'fake')
+RESULTS = os.path.join(conf_dirs.TMP, 'bench')
+SLOWER = 1.2 # ratio to report as regression
+
+def steps(keys, media):
+  r"""
+  list of (name, command) in order to run.
+  a new article from init to publish, then checkouts of a published one.
+  """
+  published = keys[len(keys) // 2]
+  return [
+    ('show_status', ['show_status.py']),
+    ('show_status_concurrent', ['show_status.py', '--concurrent']),
+    ('base_init', ['base_init.py', '-n', 'benchnew', '-t', 'benchmark']),
+    ('base_add_media', ['base_add_media.py', '-f', *media]),
+    ('base_commit', ['base_commit.py', '-m', 'add media']),
+    ('zenn_init', ['zenn_init.py']),
+    ('qiita_init', ['qiita_init.py']),
+    ('zenn_update', ['zenn_update.py']),
+    ('qiita_update', ['qiita_update.py']),
+    ('all_publish_dry', ['all_publish.py', '--dry']),
+    ('all_publish', ['all_publish.py']),
+    ('base_checkout', ['base_checkout.py', published]),
+    ('zenn_checkout', ['zenn_checkout.py', published]),
+    ('qiita_checkout', ['qiita_checkout.py', published]),
+  ]
+
+def run_step(env, log, name, command):
+  r"""
+  run a step as a subprocess, output goes to log
+  """
+  start = time.perf_counter()
+  with open(log, 'w') as f:
+    result = subprocess.run([sys.executable, *command], cwd=TOOL_DIR, env=env, stdout=f, stderr=subprocess.STDOUT)
+  seconds = time.perf_counter() - start
+  status = 'OK' if result.returncode == 0 else f'FAILED ({result.returncode}) see {log}'
+  print(f'  {name:24} {seconds:8.2f}s  {status}')
+  return {'seconds': seconds, 'returncode': result.returncode}
+
+def bench_size(work, size, args):
+  r"""
+  make a corpus of size articles and run all steps on it
+  """
+  root = os.path.join(work, str(size))
+  print(f'=== {size} articles at {root} ===')
+  start = time.perf_counter()
+  keys = bench_corpus.make_corpus(root, size, args.series, args.tags, args.media, args.seed)
+  corpus_seconds = time.perf_counter() - start
+  print(f'  {"corpus":24} {corpus_seconds:8.2f}s')
+
+  media = []
+  for n in range(3):
+    path = os.path.join(root, f'picture{n}.png')
+    bench_corpus.write(path, bench_corpus.PNG)
+    media.append(path)
+
+  env = bench_corpus.git_env(root)
+  if not args.real:
+    # gh and npx are offline stand-ins
+    env['PATH'] = f'{FAKE_DIR}{os.pathsep}{env.get("PATH", "")}'
+    env['ARTICLE_FAKE_STATE'] = os.path.join(root, 'fake_state.json')
+    env['ARTICLE_FAKE_LATENCY'] = args.latency
+  logs = os.path.join(root, 'logs')
+  os.makedirs(logs, exist_ok=True)
+  results = {}
+  for name, command in steps(keys, media):
+    if args.steps and name not in args.steps:
+      continue
+    results[name] = run_step(env, os.path.join(logs, f'{name}.log'), name, command)
+  return {'corpus_seconds': corpus_seconds, 'steps': results}
+
+def git_version():
+  return Run.run_capture('.', ['git', '--version']).stdout.strip()
+
+def previous_results(results_dir, current):
+  r"""
+  latest results file before current, None if not found
+  """
+  files = sorted(path for path in glob.glob(os.path.join(results_dir, 'bench_*.json')) if path != current)
+  if len(files) == 0:
+    return None
+  with open(files[-1], 'r') as f:
+    return files[-1], json.load(f)
+
+def compare(results, previous):
+  r"""
+  print seconds against previous run
+  """
+  path, old = previous
+  print(f'=== compared with {path} ===')
+  for size, result in results['sizes'].items():
+    old_steps = old.get('sizes', {}).get(size, {}).get('steps', {})
+    for name, step in result['steps'].items():
+      if name not in old_steps:
+        continue
+      ratio = step['seconds'] / max(old_steps[name]['seconds'], 1e-9)
+      mark = 'SLOWER' if ratio > SLOWER else ''
+      print(f'  {size:>6} {name:24} {old_steps[name]["seconds"]:8.2f}s -> {step["seconds"]:8.2f}s  x{ratio:5.2f} {mark}')
+
+def bench(args):
+  r"""
+  run benchmark for all sizes, save results as JSON
+  """
+  work = os.path.abspath(args.work) if args.work else tempfile.mkdtemp(prefix='article_bench_')
+  now = datetime.datetime.now()
+  results = {
+    'created': now.isoformat(timespec='seconds'),
+    'python': platform.python_version(),
+    'git': git_version(),
+    'platform': platform.platform(),
+    'parameters': {'series': args.series, 'tags': args.tags, 'media': args.media, 'seed': args.seed, 'real': args.real, 'latency': args.latency},
+    'sizes': {},
+  }
+  try:
+    for size in args.sizes:
+      results['sizes'][str(size)] = bench_size(work, size, args)
+  finally:
+    if args.keep or args.work:
+      print(f'corpora are kept at {work}')
+    else:
+      shutil.rmtree(work, ignore_errors=True)
+
+  os.makedirs(args.results, exist_ok=True)
+  path = os.path.join(args.results, f'bench_{now.strftime("%Y%m%d_%H%M%S")}.json')
+  with open(path, 'w') as f:
+    json.dump(results, f, indent=2)
+    f.write('\n')
+  print(f'results: {path}')
+  previous = previous_results(args.results, path)
+  if previous is not None:
+    compare(results, previous)
+  return results
+
+def main():
+  print('main launched manually.')
+  description = 'benchmark entry points on synthetic corpora of growing size.'
+  arg_sizes = 'numbers of articles (optional)'
+  arg_steps = 'steps to run, default: all (optional)'
+  arg_work = 'directory for corpora, kept after run (optional)'
+  arg_keep = 'keep temporary corpora (optional)'
+  arg_results = 'directory to save results (optional)'
+  arg_series = 'number of series (optional)'
+  arg_tags = 'number of tags (optional)'
+  arg_media = 'number of media files per article (optional)'
+  arg_seed = 'random seed (optional)'
+  arg_real = 'use real gh and npx rather than fake/ (optional)'
+  arg_latency = 'latency of fake gh and npx, `0.5` or `gh=0.3,npx=2` (optional)'
+  myself = 'bench_all.py'
+
+  f"""
+  purpose:
+    {description}
+
+  usage:
+    ./{myself}
+    ./{myself} -s 10 100
+    ./{myself} -s 1000 --steps show_status base_checkout --keep
+    ./{myself} -s 100 --latency 'gh=0.5,npx=2'
+
+  arguments:
+    -s: {arg_sizes}
+    --steps: {arg_steps}
+    -w: {arg_work}
+    --keep: {arg_keep}
+    -r: {arg_results}
+    --series: {arg_series}
+    --tags: {arg_tags}
+    --media: {arg_media}
+    --seed: {arg_seed}
+    --real: {arg_real}
+    --latency: {arg_latency}
+  """
+
+  parser = argparse.ArgumentParser(description=description)
+  parser.add_argument('-s', '--sizes', help=arg_sizes, nargs='+', type=int, default=[10, 100, 1000, 10000])
+  parser.add_argument('--steps', help=arg_steps, nargs='+', default=[])
+  parser.add_argument('-w', '--work', help=arg_work, default=None)
+  parser.add_argument('--keep', help=arg_keep, default=False, action='store_true')
+  parser.add_argument('-r', '--results', help=arg_results, default=RESULTS)
+  parser.add_argument('--series', help=arg_series, default=3, type=int)
+  parser.add_argument('--tags', help=arg_tags, default=50, type=int)
+  parser.add_argument('--media', help=arg_media, default=1, type=int)
+  parser.add_argument('--seed', help=arg_seed, default=0, type=int)
+  parser.add_argument('--real', help=arg_real, default=False, action='store_true')
+  parser.add_argument('--latency', help=arg_latency, default='')
+  args = parser.parse_args()
+
+  print(args)
+  bench(args)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+generate a synthetic DOC_HOME for benchmark.
+copyright 2026, hanagai
+
+bench_corpus.py
+version: October 18, 2026
+"""
+
+import argparse
+import datetime
+import json
+import os
+import os.path
+import random
+from conf import *
+from common_run import Run
+
+REPOS = ['article-base-doc', 'article-zenn-doc', 'article-qiita-doc']
+ACCOUNT = 'bench'
+FIRST_DAY = datetime.date(2019, 5, 1) # Reiwa 1
+ARTICLES_PER_DAY = 3
+README_MARKER = '<!-- ARTICLES DESCENDANT -->\n'
+# 1x1 transparent png
+PNG = bytes.fromhex(
+  '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+  '1f15c4890000000d49444154789c63600000000200015e2e29b80000000049454e44ae426082'
+)
+
+def git(cwd, *args):
+  r"""
+  run git quietly, raise on error
+  """
+  result = Run.run_capture(cwd, ['git', *args])
+  if result.returncode != 0:
+    print(result.stderr)
+    raise RuntimeError(f'Error: git {" ".join(args)} at {cwd}')
+  return result.stdout
+
+def git_env(root, account=ACCOUNT, env=None):
+  r"""
+  environment to run tools on the corpus.
+  GitHub urls are redirected to local bare remotes, identity is set if missing.
+  """
+  env = dict(os.environ if env is None else env)
+  count = int(env.get('GIT_CONFIG_COUNT', '0'))
+  env[f'GIT_CONFIG_KEY_{count}'] = f'url.{os.path.join(root, "remotes")}/.insteadOf'
+  env[f'GIT_CONFIG_VALUE_{count}'] = f'https://{account}@github.com/{account}/'
+  env['GIT_CONFIG_COUNT'] = str(count + 1)
+  for name in ['GIT_AUTHOR_NAME', 'GIT_COMMITTER_NAME']:
+    env.setdefault(name, ACCOUNT)
+  for name in ['GIT_AUTHOR_EMAIL', 'GIT_COMMITTER_EMAIL']:
+    env.setdefault(name, f'{ACCOUNT}@example.com')
+  env[conf_dirs.DOC_HOME_ENV] = os.path.join(root, account)
+  return env
+
+def make_keys(articles):
+  r"""
+  keys of articles, some articles a day from Reiwa 1
+  """
+  keys = []
+  for i in range(articles):
+    day = FIRST_DAY + datetime.timedelta(days=i // ARTICLES_PER_DAY)
+    keys.append(f'{conf_current.date_format_reiwa(day)}_bench{i:05d}')
+  return keys
+
+def pick_tags(rng, pool):
+  r"""
+  3 to 6 tags, popular tags are picked more
+  """
+  weights = [1 / (rank + 1) for rank in range(len(pool))]
+  return sorted(set(rng.choices(pool, weights=weights, k=rng.randint(3, 6))))
+
+def write(path, content):
+  os.makedirs(os.path.dirname(path), exist_ok=True)
+  mode = 'wb' if isinstance(content, bytes) else 'w'
+  with open(path, mode) as f:
+    f.write(content)
+
+def base_md(key, title, media):
+  r"""
+  document with sections, a code block and media links
+  """
+  links = ''.join(f'![{name}](https://{ACCOUNT}.github.io/article-base-doc/{name})\n' for name in media)
+  return f'''# {title}
+
+---
+
+# 🌒️ 序
+
+{key} is a synthetic article for benchmark.
+
+# 🌕️ 破
+
+```python
+print('{key}')
+```
+
+{links}
+# 🌖️ 急
+
+done.
+'''
+
+def make_article(home, rng, key, series, tags, media):
+  r"""
+  write base yaml, md, media, zenn and qiita article of a key
+  """
+  base = os.path.join(home, 'article-base-doc', 'docs')
+  title = f'{key} について、とりあえずメモ'
+  write(os.path.join(base, f'met{series}', f'{key}.yaml'), f'title: {title}\ntags: {" ".join(tags)}\ntype: tech\nemoji: 🐚\n')
+  names = [f'medi{series}/{key}_{n}.png' for n in range(media)]
+  for name in names:
+    write(os.path.join(base, name), PNG)
+  body = base_md(key, title, names)
+  write(os.path.join(base, series, f'{key}.md'), body)
+
+  topics = '["' + '", "'.join(tags) + '"]'
+  slug = f'{key}-{rng.randint(10000, 99999)}'
+  write(os.path.join(home, 'article-zenn-doc', 'articles', f'{slug}.md'),
+    f'---\ntitle: "{title}"\ntopics: {topics}\ntype: "tech"\nemoji: "🐚"\npublished: true\n---\n{body}')
+  qiita_tags = ''.join(f'  - {tag}\n' for tag in tags)
+  write(os.path.join(home, 'article-qiita-doc', 'public', f'{key}.md'),
+    f"---\ntitle: '{title}'\ntags:\n{qiita_tags}private: false\nupdated_at: ''\nid: null\norganization_url_name: null\nslide: false\nignorePublish: false\n---\n{body}")
+
+def init_repo(root, home, repo):
+  r"""
+  commit all files to main, push to a local bare remote as origin
+  """
+  path = os.path.join(home, repo)
+  remote = os.path.join(root, 'remotes', f'{repo}.git')
+  os.makedirs(path, exist_ok=True)
+  git(path, 'init', '-q', '-b', 'main')
+  git(path, 'add', '-A')
+  git(path, '-c', f'user.name={ACCOUNT}', '-c', f'user.email={ACCOUNT}@example.com', 'commit', '-q', '--allow-empty', '-m', 'synthetic corpus')
+  git(root, 'init', '-q', '--bare', remote)
+  git(path, 'remote', 'add', 'origin', remote)
+  git(path, 'push', '-q', '-u', 'origin', 'main')
+
+def make_corpus(root, articles=100, series=3, tags=50, media=1, seed=0):
+  r"""
+  make DOC_HOME at root/bench with repositories and bare remotes.
+  return keys of articles
+  """
+  home = os.path.join(root, ACCOUNT)
+  if os.path.exists(home):
+    raise ValueError(f'Error: {home} already exists')
+  rng = random.Random(seed)
+  pool = [f'tag{n:03d}' for n in range(tags)]
+  all_series = [chr(ord('a') + n) for n in range(series)]
+  keys = make_keys(articles)
+  for key in keys:
+    make_article(home, rng, key, rng.choice(all_series), pick_tags(rng, pool), media)
+  write(os.path.join(home, 'article-base-doc', 'README.md'), f'# articles\n\n{README_MARKER}')
+  write(os.path.join(home, 'article-zenn-doc', 'articles', '.keep'), '')
+  write(os.path.join(home, 'article-qiita-doc', 'public', '.keep'), '')
+  for repo in REPOS:
+    init_repo(root, home, repo)
+
+  # current article is the last one, published already
+  key = keys[-1] if keys else None
+  if key is not None:
+    yaml = [path for path in [os.path.join(home, 'article-base-doc', 'docs', f'met{s}', f'{key}.yaml') for s in all_series] if os.path.exists(path)][0]
+    current = {
+      'series': os.path.basename(os.path.dirname(yaml))[len('met'):],
+      'key': key,
+      'now': key.split('_')[0],
+      'name': key.split('_', 1)[1],
+    }
+    state = {'version': conf_current.STATE_VERSION, 'current': current}
+    write(os.path.join(home, 'article-markdown-tool', 'tmp', 'current.json'), json.dumps(state, indent=2) + '\n')
+  return keys
+
+def main():
+  print('main launched manually.')
+  description = 'generate a synthetic DOC_HOME for benchmark.'
+  arg_root = 'directory to create, DOC_HOME is <root>/bench'
+  arg_articles = 'number of articles (optional)'
+  arg_series = 'number of series (optional)'
+  arg_tags = 'number of tags to choose from (optional)'
+  arg_media = 'number of media files per article (optional)'
+  arg_seed = 'random seed (optional)'
+  myself = 'bench_corpus.py'
+
+  f"""
+  purpose:
+    {description}
+
+  usage:
+    ./{myself} /tmp/corpus
+    ./{myself} /tmp/corpus -a 10000 -s 5 -k 300 -m 2
+    ARTICLE_DOC_HOME=/tmp/corpus/bench ./show_status.py
+
+  arguments:
+    1st: {arg_root}
+    -a: {arg_articles}
+    -s: {arg_series}
+    -k: {arg_tags}
+    -m: {arg_media}
+    --seed: {arg_seed}
+  """
+
+  parser = argparse.ArgumentParser(description=description)
+  parser.add_argument('root', help=arg_root)
+  parser.add_argument('-a', '--articles', help=arg_articles, default=100, type=int)
+  parser.add_argument('-s', '--series', help=arg_series, default=3, type=int)
+  parser.add_argument('-k', '--tags', help=arg_tags, default=50, type=int)
+  parser.add_argument('-m', '--media', help=arg_media, default=1, type=int)
+  parser.add_argument('--seed', help=arg_seed, default=0, type=int)
+  args = parser.parse_args()
+
+  print(args)
+  root = os.path.abspath(args.root)
+  keys = make_corpus(root, args.articles, args.series, args.tags, args.media, args.seed)
+  env = git_env(root, env={})
+  print(f'{len(keys)} articles at {env[conf_dirs.DOC_HOME_ENV]}')
+  print('to run tools on the corpus:')
+  for name, value in env.items():
+    print(f'  export {name}={value}')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+benchmark reading refs natively against git command.
+copyright 2026, hanagai
+
+bench_refs.py
+version: October 18, 2026
+"""
+
+import argparse
+import time
+from conf import *
+from common_run import Run
+from common_refs import GitRefs
+from common_repo_state import RepoState
+
+def timeit(label, func, number):
+  r"""
+  run func number times and print average
+  """
+  start = time.perf_counter()
+  for _ in range(number):
+    result = func()
+  elapsed = (time.perf_counter() - start) / number
+  print(f'{label:40} {elapsed * 1e6:12.1f} us  {result}')
+  return elapsed
+
+def git_current_branch(cwd):
+  return Run.run_capture(cwd, ['git', 'branch', '--show-current']).stdout.strip()
+
+def git_exists_branch(cwd, branch):
+  return len(Run.run_capture(cwd, ['git', 'branch', '--list', branch]).stdout.strip()) > 0
+
+def git_exists_remote_branch(cwd, branch):
+  return len(Run.run_capture(cwd, ['git', 'branch', '--remote', '--list', f'origin/{branch}']).stdout.strip()) > 0
+
+def bench(cwd, branch, number):
+  r"""
+  compare git command, native read and cached state
+  """
+  print(f'=== {cwd} branch={branch} number={number} ===')
+  refs = GitRefs(cwd)
+  state = RepoState(cwd)
+  native = refs.read()
+  git = state.compute_git()
+  same = (native['head'].removeprefix('refs/heads/'), native['head_oid'], native['oids']) == (git['current_branch'], git['head_oid'], git['oids'])
+  print(f'native read matches git command: {same}')
+
+  results = {}
+  results['git current branch'] = timeit('git branch --show-current', lambda: git_current_branch(cwd), number)
+  results['git exists branch'] = timeit('git branch --list', lambda: git_exists_branch(cwd, branch), number)
+  results['git exists remote'] = timeit('git branch --remote --list', lambda: git_exists_remote_branch(cwd, branch), number)
+  results['native read'] = timeit('GitRefs.read', lambda: GitRefs(cwd).read()['head'], number)
+  results['state current branch'] = timeit('RepoState.current_branch', state.current_branch, number)
+  results['state exists branch'] = timeit('RepoState.local_branches', lambda: branch in state.local_branches(), number)
+  results['state exists remote'] = timeit('RepoState.remote_branches', lambda: f'origin/{branch}' in state.remote_branches(), number)
+  return results
+
+def main():
+  print('main launched manually.')
+  description = 'benchmark reading refs natively against git command.'
+  arg_repo = 'repository path, default: base'
+  arg_branch = 'branch to check existence, default: current key'
+  arg_number = 'number of iterations (optional)'
+  myself = 'bench_refs.py'
+
+  f"""
+  purpose:
+    {description}
+
+  usage:
+    ./{myself}
+    ./{myself} -r ../../article-zenn-doc -n 100
+
+  arguments:
+    -r: {arg_repo}
+    -b: {arg_branch}
+    -n: {arg_number}
+  """
+
+  parser = argparse.ArgumentParser(description=description)
+  parser.add_argument('-r', '--repo', help=arg_repo, default=conf_dirs.BASE)
+  parser.add_argument('-b', '--branch', help=arg_branch, default=conf_current.get_current('key') or 'main')
+  parser.add_argument('-n', '--number', help=arg_number, default=50, type=int)
+  args = parser.parse_args()
+
+  print(args)
+  bench(args.repo, args.branch, args.number)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+run commands and jobs on asyncio, one at a time per repository.
+copyright 2026, hanagai
+
+common_async.py
+version: October 18, 2026
+"""
+
+import asyncio
+import contextlib
+import os
+import os.path
+import subprocess
+import sys
+from common_run import Run
+from common_refs import GitRefs, UnsupportedRepository
+from common_parallel import PrefixedOutput, run_job
+
+# global bound of commands and jobs running at once
+MAX_PARALLEL_ENV = 'ARTICLE_MAX_PARALLEL'
+# commands wait on network and disk mostly, not bound by cpus
+DEFAULT_MAX_PARALLEL = 8
+
+def max_parallel_default():
+  r"""
+  ARTICLE_MAX_PARALLEL, or DEFAULT_MAX_PARALLEL
+  """
+  value = os.environ.get(MAX_PARALLEL_ENV, '')
+  if value.isdigit() and int(value) > 0:
+    return int(value)
+  return DEFAULT_MAX_PARALLEL
+
+class Scheduler:
+  r"""
+  run commands and blocking jobs on asyncio.
+  commands on the same repository run one by one, git index lock forbids parallel writes.
+  different repositories run concurrently, max_parallel at most in total.
+  """
+
+  def __init__(self, max_parallel=None):
+    self.max_parallel = max_parallel or max_parallel_default()
+    self._semaphore = None
+    self._locks = {}
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.max_parallel},'
+      f'{len(self._locks)},'
+      f')'
+    )
+
+  @staticmethod
+  def repo_key(cwd):
+    r"""
+    git dir of the repository, worktrees have their own index
+    """
+    try:
+      return GitRefs(cwd).git_dirs()[0]
+    except (UnsupportedRepository, OSError):
+      return os.path.abspath(cwd)
+
+  def semaphore(self):
+    if self._semaphore is None:
+      self._semaphore = asyncio.Semaphore(self.max_parallel)
+    return self._semaphore
+
+  def lock(self, key):
+    if key not in self._locks:
+      self._locks[key] = asyncio.Lock()
+    return self._locks[key]
+
+  @contextlib.asynccontextmanager
+  async def slot(self, cwd):
+    r"""
+    wait for the repository, then for a global slot
+    """
+    async with self.lock(self.repo_key(cwd)):
+      async with self.semaphore():
+        yield
+
+  async def run(self, cwd, command, input=None, env=None):
+    r"""
+    run command and return CompletedProcess without printing.
+    never raises on exit code, same as Run.run_capture
+    """
+    async with self.slot(cwd):
+      with Run.span(cwd, command) as trace:
+        process = await asyncio.create_subprocess_exec(
+          *command, cwd=cwd, env=env,
+          stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate(None if input is None else input.encode())
+        trace.update(exit_code=process.returncode, bytes_out=len(stdout) + len(stderr))
+        return subprocess.CompletedProcess(command, process.returncode, stdout.decode(), stderr.decode())
+
+  async def call(self, cwd, func, *args):
+    r"""
+    run a blocking function on a thread, as a command on the repository
+    """
+    async with self.slot(cwd):
+      return await asyncio.to_thread(func, *args)
+
+def run_commands(commands, max_parallel=None):
+  r"""
+  run list of (cwd, command), return CompletedProcess in order
+  """
+  scheduler = Scheduler(max_parallel)
+
+  async def run_all():
+    return await asyncio.gather(*(scheduler.run(cwd, command) for cwd, command in commands))
+
+  return asyncio.run(run_all())
+
+def run_jobs(jobs, max_parallel=None):
+  r"""
+  run list of (name, repository path, func), blocking functions.
+  output of each job is prefixed by its name.
+  return list of JobResult in order of jobs.
+  """
+  if len(jobs) == 0:
+    return []
+  scheduler = Scheduler(max_parallel)
+  width = max(len(name) for name, cwd, func in jobs)
+  output = PrefixedOutput(sys.stdout)
+
+  async def run_all():
+    return await asyncio.gather(*(
+      scheduler.call(cwd, run_job, output, f'[{name:{width}}] ', name, func) for name, cwd, func in jobs
+    ))
+
+  sys.stdout = output
+  try:
+    return asyncio.run(run_all())
+  finally:
+    sys.stdout = output.stream
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  import time
+  from common_parallel import print_results
+  print(Scheduler())
+  start = time.perf_counter()
+  results = run_commands([('.', ['sleep', '0.2']), ('.', ['sleep', '0.2']), ('/tmp', ['sleep', '0.2'])])
+  print([result.returncode for result in results], f'{time.perf_counter() - start:.2f}s, 0.4s expected')
+  def job(name):
+    def run():
+      print(f'{name} running')
+      time.sleep(0.1)
+      return name
+    return run
+  results = run_jobs([('a', '.', job('a')), ('b', '.', job('b')), ('c', '/tmp', job('c'))], max_parallel=1)
+  print_results(results)
+
+if __name__ == '__main__':
+  test()
@@ -6,13 +6,13 @@ base class to checkout article published
 copyright 2025, hanagai
 
 common_checkout.py
-version: June 1, 2025
+version: October 18, 2026
 """
 
-import os.path
 import datetime
 import re
 from conf import *
+import common_trace
 
 class CommonCheckout:
     r"""
@@ -46,6 +46,7 @@ class CommonCheckout:
         r"""
         notify message
         """
+        common_trace.phase(self.__class__.__name__, message)
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         doc = re.sub(r'\n', '\n-   ', self.__doc__)
         print(f'''---
@@ -75,36 +76,21 @@ class CommonCheckout:
 
     def find_series_from_key(self, key):
         r"""
-        return series for key by searching yaml files
+        return series for key by searching meta index
         """
-        yaml_list = conf_current.with_all_meta_yaml(self.parse_yaml_path)
-        found = [x for x in yaml_list if x[0] == key]
+        found = conf_current.meta_index().series_of(key)
         #print(found)
         match len(found):
             case 0:
                 print(f'WARN: {key} not found in files published.')
                 raise RuntimeError
             case 1:
-                return found[0][1]
+                return found[0]
             case _:
                 print(f'WARN: {key} found duplicated in files published.')
-                print(yaml_list)
+                print(found)
                 raise RuntimeError
 
-    def parse_yaml_path(self, yaml_path):
-        r"""
-        parse yaml path and return [key, series]
-        """
-        #docs, meta, yaml = yaml_path.rsplit(os.path.sep, 2)
-        yaml = os.path.basename(yaml_path)
-        meta = os.path.basename(os.path.dirname(yaml_path))
-        #print([meta, yaml])
-        key = re.sub(r'\.yaml$', '', yaml)
-        series = re.sub(r'^met', '', meta)
-        values = [key, series]
-        #print(values)
-        return values
-
     def set_current(self, key):
         r"""
         set current for the key
@@ -119,8 +105,7 @@ class CommonCheckout:
             if self.dry_run:
                 print('DRY-RUN: not change current')
             else:
-                for memory in self.memories:
-                    conf_current.set_current(memory, updates[memory])
+                conf_current.set_currents({memory: updates[memory] for memory in self.memories})
                 self.show_current('AFTER')
 
     def checkout(self, key):
@@ -6,15 +6,121 @@ base class to handle git diff; git add -u;
 copyright 2025, hanagai
 
 common_diff.py
-version: June 1, 2025
+version: October 18, 2026
 """
 
 import argparse
 import datetime
+import difflib
+import hashlib
+import json
+import os.path
 import re
 from conf import *
+import common_trace
+import common_transform
 from common_run import Run
 
+SECTION = re.compile(r'^ {0,3}#{1,6}(\s|$)')
+
+def sections(lines):
+    r"""
+    section title of each line, by headings out of fenced code.
+    lines of the head are `(front matter)`, the rest before the first heading `(top)`.
+    """
+    titles = []
+    title = '(top)'
+    fence = None
+    front = False
+    for index, line in enumerate(lines):
+        matched = common_transform.FENCE.match(line)
+        if front:
+            if conf_meta.classify(line)[0] == conf_meta.SEPARATOR:
+                front = False
+                titles.append(title)
+                title = '(top)'
+                continue
+        elif fence is not None:
+            if matched and matched.group(1)[0] == fence[0] and line.strip() == matched.group(1):
+                fence = None
+        elif matched:
+            fence = matched.group(1)
+        elif SECTION.match(line):
+            title = line.strip()
+        elif index == 0 and conf_meta.classify(line)[0] == conf_meta.SEPARATOR:
+            front = True
+            title = '(front matter)'
+        titles.append(title)
+    return titles
+
+def unified_range(start, stop):
+    r"""
+    range of a hunk header, same as difflib.unified_diff
+    """
+    length = stop - start
+    if length == 1:
+        return f'{start + 1}'
+    return f'{start + 1 if length else start},{length}'
+
+def diff_summary(name, old, new, context=3):
+    r"""
+    summary of changes from old to new text, equal hashes short-circuit.
+    lines in common at both ends are not matched, the rest is matched once
+    for both section stats and the unified diff.
+    'diff' is the unified diff lines, other items are for JSON.
+    """
+    old_hash = hashlib.sha256(old.encode()).hexdigest()
+    new_hash = hashlib.sha256(new.encode()).hexdigest()
+    summary = {'path': name, 'old_sha256': old_hash, 'new_sha256': new_hash, 'changed': old_hash != new_hash}
+    if not summary['changed']:
+        summary.update({'added': 0, 'removed': 0, 'sections': [], 'diff': []})
+        return summary
+    old_lines = old.splitlines()
+    new_lines = new.splitlines()
+    limit = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    # context lines at both ends are kept for hunks of the unified diff
+    start = max(prefix - context, 0)
+    old_stop = len(old_lines) - max(suffix - context, 0)
+    new_stop = len(new_lines) - max(suffix - context, 0)
+    matcher = difflib.SequenceMatcher(None, old_lines[start:old_stop], new_lines[start:new_stop])
+
+    old_titles = sections(old_lines)
+    new_titles = sections(new_lines)
+    stats = {}
+    def count(title, kind, n):
+        stats.setdefault(title, {'section': title, 'added': 0, 'removed': 0})[kind] += n
+    diff = [f'--- a/{name}', f'+++ b/{name}']
+    for group in matcher.get_grouped_opcodes(context):
+        first, last = group[0], group[-1]
+        diff.append(
+            f'@@ -{unified_range(start + first[1], start + last[2])}'
+            f' +{unified_range(start + first[3], start + last[4])} @@'
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                diff.extend(f' {line}' for line in old_lines[start + i1:start + i2])
+                continue
+            for i in range(start + i1, start + i2):
+                count(old_titles[i], 'removed', 1)
+                diff.append(f'-{old_lines[i]}')
+            for j in range(start + j1, start + j2):
+                count(new_titles[j], 'added', 1)
+                diff.append(f'+{new_lines[j]}')
+    summary.update({
+        'added': sum(item['added'] for item in stats.values()),
+        'removed': sum(item['removed'] for item in stats.values()),
+        'sections': list(stats.values()),
+        'diff_lines': len(diff),
+        'diff': diff,
+    })
+    return summary
+
 class CommonDiff:
     r"""
     base class to handle git diff; git add -u;
@@ -22,6 +128,7 @@ class CommonDiff:
 
     dry_run = False
     pager = True
+    max_diff_lines = 200
 
     def git(self):
         r"""
@@ -80,6 +187,7 @@ class CommonDiff:
         r"""
         notify message
         """
+        common_trace.phase(self.__class__.__name__, message)
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         doc = re.sub(r'\n', '\n-   ', self.__doc__)
         print(f'''---
@@ -88,15 +196,22 @@ class CommonDiff:
     ---
     ''')
 
-    def diff_and_add(self):
+    def diff_and_add(self, path=None, new=None):
         r"""
-        make initial documents
+        show diff and git add -u.
+        with path and new text of a rendered article, the diff from HEAD is made in process.
         """
         self.notify('Begin')
 
-        self.show_git_diff()
-        self.show_git_diff_cached()
-        self.show_status()
+        if path is not None:
+            summary = self.show_native_diff(path, self.committed_text(path), new)
+            if not summary['changed']:
+                print(f'no changes from HEAD: {os.path.relpath(path, self.local_path())}')
+        else:
+            summary = None
+            self.show_git_diff()
+            self.show_git_diff_cached()
+            self.show_status()
 
         if self.dry_run:
             print('DRY RUN: skip git add -u')
@@ -107,6 +222,33 @@ class CommonDiff:
             self.show_status()
 
         self.notify('Done')
+        return summary
+
+    def committed_text(self, path):
+        r"""
+        text of path at HEAD, empty if not committed yet
+        """
+        relative = os.path.relpath(path, self.local_path())
+        result = Run.run_capture(self.local_path(), ['git', 'show', f'HEAD:{relative}'])
+        return result.stdout if result.returncode == 0 else ''
+
+    def show_native_diff(self, path, old, new):
+        r"""
+        show per section stats and capped unified diff of old and new text,
+        then summary as a JSON line.
+        """
+        summary = diff_summary(os.path.relpath(path, self.local_path()), old or '', new)
+        if not summary['changed']:
+            return summary
+        for section in summary['sections']:
+            print(f"  +{section['added']:<5} -{section['removed']:<5} {section['section']}")
+        lines = summary.pop('diff')
+        for line in lines[:self.max_diff_lines]:
+            print(line)
+        if len(lines) > self.max_diff_lines:
+            print(f'... {len(lines) - self.max_diff_lines} more lines of diff')
+        print(f'diff summary: {json.dumps(summary, ensure_ascii=False)}')
+        return summary
 
 def main():
   print('main launched manually.')
@@ -133,5 +275,26 @@ def main():
   print(args)
   CommonDiff(dry_run=args.dry).diff_and_add()
 
+# Test function to demonstrate usage
+def test():
+    print('test launched manually.')
+    import time
+    old = '---\ntitle: a\n---\n# top\nline\n```\n# not a section\n```\n## b\nkept\n'
+    new = old.replace('line', 'changed') + '## c\nadded\n'
+    summary = diff_summary('a.md', old, new)
+    print('\n'.join(summary.pop('diff')))
+    print(summary)
+    # article shaped, blank, fence and code lines repeat
+    for size in [1000, 10000, 100000]:
+        lines = ['---', 'title: a', '---', '# top']
+        for n in range(size // 7):
+            lines.extend(['', f'## section {n}', f'text {n}', '```', 'code', '```', ''])
+        changed = list(lines)
+        changed[len(changed) // 2] = 'changed'
+        changed[5] = 'changed at top'
+        start = time.perf_counter()
+        summary = diff_summary('a.md', '\n'.join(lines), '\n'.join(changed))
+        print(f"{len(lines)} lines: +{summary['added']} -{summary['removed']} in {time.perf_counter() - start:.3f}s, less than 1s expected")
+
 if __name__ == '__main__':
     main()
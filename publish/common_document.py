@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+article document parsed once, front matter and body.
+copyright 2026, hanagai
+
+common_document.py
+version: October 18, 2026
+"""
+
+import os.path
+from conf import *
+
+class ArticleDocument:
+    r"""
+    article document parsed once, front matter and body.
+    lines keep their line ends, offsets are in bytes of utf-8.
+    lines are classified by conf_meta.classify on first use.
+    """
+
+    def __init__(self, lines, path=None):
+        # lines: list of lines with line ends
+        # path: file read from (optional)
+        self.lines = lines
+        self.path = path
+        self.offsets = []
+        offset = 0
+        for line in lines:
+            self.offsets.append(offset)
+            offset += len(line.encode())
+        self.size = offset
+        self._kinds = {}
+        self.head_end = self.find_head_end()
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.path},'
+            f'{len(self.lines)},'
+            f'{self.head_end},'
+            f')'
+        )
+
+    @classmethod
+    def parse(cls, text, path=None):
+        r"""
+        document of whole text
+        """
+        return cls(text.splitlines(keepends=True), path)
+
+    @classmethod
+    def read(cls, path):
+        r"""
+        document of whole file
+        """
+        with open(path, 'r') as file:
+            return cls.parse(file.read(), path)
+
+    def kind(self, index):
+        r"""
+        (kind, yaml key) of a line
+        """
+        if index not in self._kinds:
+            self._kinds[index] = conf_meta.classify(self.lines[index])
+        return self._kinds[index]
+
+    def is_kind(self, index, kind):
+        return self.kind(index)[0] == kind
+
+    def find_head_end(self):
+        r"""
+        index after the 2nd separator, None if no head
+        """
+        if len(self.lines) == 0 or not self.is_kind(0, conf_meta.SEPARATOR):
+            return None
+        for index in range(1, len(self.lines)):
+            if self.is_kind(index, conf_meta.SEPARATOR):
+                return index + 1
+        return None
+
+    def validate_head(self):
+        r"""
+        raise ValueError if the head is broken
+        """
+        if len(self.lines) == 0 or not self.is_kind(0, conf_meta.SEPARATOR):
+            first = self.lines[0] if self.lines else ''
+            message = f'Error: broken content. 1st line must be a separator. {first}'
+            print(message)
+            raise ValueError(message)
+        # it still allows head only document (blank new),
+        # but a head only one also has the 2nd separator.
+        if self.head_end is None:
+            message = f'Error: broken content. No 2nd separator.'
+            print(self.lines)
+            print(message)
+            raise ValueError(message)
+
+    def head_lines(self):
+        r"""
+        lines of the head, including both separators
+        """
+        return self.lines[:self.head_end or 0]
+
+    def head_items(self):
+        r"""
+        list of (line, kind, yaml key) in the head
+        """
+        return [(self.lines[index], *self.kind(index)) for index in range(self.head_end or 0)]
+
+    def head_text(self):
+        return ''.join(self.head_lines())
+
+    def front_matter(self):
+        r"""
+        conf_meta.FrontMatter of the head, None if no head
+        """
+        return conf_meta.parse_front_matter(self.head_text())
+
+    def body_offset(self):
+        r"""
+        byte offset of the body
+        """
+        if self.head_end is None:
+            return 0
+        return self.offsets[self.head_end] if self.head_end < len(self.lines) else self.size
+
+    def body_text(self):
+        r"""
+        text after the head
+        """
+        return ''.join(self.lines[self.head_end or 0:])
+
+    def text(self):
+        return ''.join(self.lines)
+
+    def until_h1(self):
+        r"""
+        (lines until the 1st `# line`, True if truncated there)
+        """
+        for index in range(len(self.lines)):
+            if self.is_kind(index, conf_meta.H1):
+                return self.lines[:index + 1], True
+        return self.lines, False
+
+
+# Test function to demonstrate usage
+def test():
+    print('test launched manually.')
+    a = ArticleDocument.parse('---\ntitle: "あ"\ntags:\n  - x\n---\n\n# h1\nbody\n')
+    print(a)
+    print(a.head_items())
+    print(a.body_offset(), repr(a.body_text()))
+    print(a.until_h1())
+    b = ArticleDocument.parse('no head\n')
+    try:
+        b.validate_head()
+    except ValueError as e:
+        print(e)
+    if conf_current.get_current('key') and os.path.exists(conf_current.qiita_path()):
+        c = ArticleDocument.read(conf_current.qiita_path())
+        print(c, c.head_text())
+
+if __name__ == '__main__':
+    test()
@@ -6,19 +6,38 @@ base class to handle GitHub repositories.
 copyright 2025, hanagai
 
 common_git.py
-version: June 1, 2025
+version: October 18, 2026
 """
 
 import os.path
 import json
+import re
 from conf import *
 from common_run import Run
+from common_repo_state import RepoState
 
 class CommonGit:
   r"""
   base class to handle GitHub repositories.
   """
 
+  # commands to modify refs, invalidate repo_state after them
+  ref_commands = [
+    ['git', 'checkout'], ['git', 'branch'], ['git', 'commit'], ['git', 'push'],
+    ['git', 'pull'], ['git', 'merge'], ['git', 'fetch'], ['gh', 'pr', 'merge'],
+  ]
+
+  # pull request state per (repository, branch) in this run
+  _pull_requests = {}
+  # number of gh invocations per repository in this run
+  _gh_counts = {}
+  # status after sync per (repository, branch) in this run
+  _synced = {}
+  # (start, oid) of branches created per (repository, branch) in this run
+  _created = {}
+  # more paths than this are passed to git add on stdin
+  pathspec_from_file_threshold = 100
+
   def local_path(self):
     return conf_dirs.BASE
     #return 'using test repository path is recommended on development and test.'
@@ -86,11 +105,7 @@ class CommonGit:
   def __init__(self, skip_initialize=False):
     if skip_initialize:
       return
-    self.git_status()
-    self.git_pull_main()
-    self.git_checkout()
-    self.git_pull()
-    self.git_status_short()
+    self.git_sync()
 
   def __str__(self):
     return (
@@ -103,9 +118,58 @@ class CommonGit:
       f')'
     )
 
-  def run_command(self, command, return_result=False):
+  def repo_state(self):
+    r"""
+    snapshot of branches in local repository
+    """
+    return RepoState.of(self.local_path())
+
+  def run_command(self, command, return_result=False, input=None):
+    cwd = self.local_path()
+    try:
+      return Run.run_command(cwd, command, return_result, input)
+    finally:
+      self.invalidate_after(command)
+
+  def run_stream(self, command, return_result=False):
+    r"""
+    run command showing output while it runs, for slow network commands
+    """
     cwd = self.local_path()
-    return Run.run_command(cwd, command, return_result)
+    try:
+      return Run.run_stream(cwd, command, return_result)
+    finally:
+      self.invalidate_after(command)
+
+  def invalidate_after(self, command):
+    r"""
+    invalidate repo_state if the command modifies refs
+    """
+    if any(command[:len(prefix)] == prefix for prefix in self.ref_commands):
+      self.repo_state().invalidate()
+
+  def run_gh(self, command, return_result=False):
+    r"""
+    run gh command, counting invocations
+    """
+    path = self.local_path()
+    self._gh_counts[path] = self._gh_counts.get(path, 0) + 1
+    return self.run_command(command, return_result)
+
+  def gh_count(self):
+    r"""
+    number of gh invocations for this repository in this run
+    """
+    return self._gh_counts.get(self.local_path(), 0)
+
+  def pull_request_key(self):
+    return (self.local_path(), self.branch())
+
+  def invalidate_pull_request(self):
+    r"""
+    forget cached pull request state, query again on next access
+    """
+    self._pull_requests.pop(self.pull_request_key(), None)
 
   def relative_path(self, file):
     if os.path.isabs(file):
@@ -125,6 +189,77 @@ class CommonGit:
     else:
       return True
 
+  def git_sync(self):
+    r"""
+    sync with remote and checkout branch, once per repository and branch in a process.
+    main and branch are fetched at once, and merged only when not up to date.
+    """
+    key = (self.local_path(), self.branch())
+    if key in self._synced:
+      print(f'already synced: {self.repo_name()}:{self.branch()}')
+      if self.git_current_branch() != self.branch():
+        self.git_checkout()
+      return self._synced[key]
+    fetched = self.git_fetch()
+    self.git_merge_fetched(self.main_branch(), fetched.get(self.main_branch()))
+    if self.git_current_branch() != self.branch():
+      self.git_checkout()
+    if self.branch() != self.main_branch():
+      self.git_merge_fetched(self.branch(), fetched.get(self.branch()))
+    status = self.git_status_short()
+    self._synced[key] = status
+    return status
+
+  def git_fetch(self):
+    r"""
+    fetch main and branch, if exists on remote, in one command.
+    origin/<branch> may be left after the branch is deleted on remote, main is fetched alone then.
+    return {branch: oid} fetched, raise RuntimeError if main is not fetched
+    """
+    if not (self.enabled() and self.enable_pull()):
+      return {}
+    main = self.main_branch()
+    if self.branch() != main and self.git_exists_remote_branch():
+      if self.run_command(['git', 'fetch', self.repo_url(), main, self.branch()]):
+        return self.read_fetch_head()
+      print(f'WARN: origin/{self.branch()} may be stale, fetch {main} alone.')
+    if not self.run_command(['git', 'fetch', self.repo_url(), main]):
+      message = f'Error: failed to fetch {main} of {self.repo_url()}'
+      print(message)
+      raise RuntimeError(message)
+    return self.read_fetch_head()
+
+  def read_fetch_head(self):
+    r"""
+    return {branch: oid} from FETCH_HEAD
+    """
+    git_dir, common_dir = self.repo_state().git_dirs()
+    fetched = {}
+    with open(os.path.join(git_dir, 'FETCH_HEAD'), 'r') as f:
+      for line in f:
+        oid, flag, description = line.rstrip('\n').split('\t', 2)
+        found = re.match(r"branch '(.+)' of ", description)
+        if found:
+          fetched[found.group(1)] = oid
+    return fetched
+
+  def git_merge_fetched(self, name, oid):
+    r"""
+    merge fetched oid into current branch, skip if already up to date
+    """
+    if oid is None or not (self.enabled() and self.enable_pull()):
+      return True
+    head = self.repo_state().head_oid()
+    if head == oid:
+      print(f'{name} is up to date: {oid}')
+      return True
+    if head is not None:
+      ancestor = Run.run_capture(self.local_path(), ['git', 'merge-base', '--is-ancestor', oid, head])
+      if ancestor.returncode == 0:
+        print(f'{name} is already merged: {oid}')
+        return True
+    return self.run_command(['git', 'merge', '--no-edit', '-m', f"Merge branch '{name}' of {self.repo_url()}", oid])
+
   def git_status(self):
     if self.enabled():
       return self.run_command(['git', 'status'])
@@ -154,10 +289,23 @@ class CommonGit:
       return True
 
   def git_add(self, file):
+    return self.git_add_files([file])
+
+  def git_add_files(self, files):
+    r"""
+    git add files in one command.
+    a long list is passed by --pathspec-from-file on stdin.
+    """
     if self.enabled() and self.enable_add():
+      if len(files) == 0:
+        return True
       if self.is_danger_here():
         raise RuntimeError('Error: prohibit git add to this branch')
-      return self.run_command(['git', 'add', self.relative_path(file)])
+      paths = [self.relative_path(file) for file in files]
+      if len(paths) > self.pathspec_from_file_threshold:
+        print(f'{len(paths)} paths on stdin')
+        return self.run_command(['git', 'add', '--pathspec-from-file=-', '--pathspec-file-nul'], input='\0'.join(paths))
+      return self.run_command(['git', 'add', '--', *paths])
     else:
       return True
 
@@ -181,32 +329,67 @@ class CommonGit:
     if self.enabled() and self.enable_push():
       if self.is_danger_here():
         raise RuntimeError('Error: prohibit git push to this branch')
-      return self.run_command(['git', 'push', '-u', self.repo_url(), self.branch()])
+      return self.run_stream(['git', 'push', '--progress', '-u', self.repo_url(), self.branch()])
     else:
       return True
 
   def git_current_branch(self):
     if self.enabled():
-      result = self.run_command(['git', 'branch', '--show-current'], return_result=True)
-      return result.stdout.strip()
+      return self.repo_state().current_branch()
 
   def git_exists_branch(self):
     if self.enabled():
-      result = self.run_command(['git', 'branch', '--list', self.branch()], return_result=True)
-      return len(result.stdout.strip()) > 0
+      return self.branch() in self.repo_state().local_branches()
     else:
       return True
 
   def git_exists_remote_branch(self):
     if self.enabled():
-      result = self.run_command(['git', 'branch', '--remote', '--list', f'origin/{self.branch()}'], return_result=True)
-      return len(result.stdout.strip()) > 0
+      return f'origin/{self.branch()}' in self.repo_state().remote_branches()
     else:
       return True
 
   def git_create_branch(self):
     if self.enabled() and self.enable_create_branch():
-      return self.run_command(['git', 'branch', self.branch(), self.main_branch()])
+      # a detached worktree has remote main merged into HEAD, not into local main
+      start = self.main_branch() if self.git_current_branch() else 'HEAD'
+      created = self.run_command(['git', 'branch', self.branch(), start])
+      if created:
+        self._created[(self.local_path(), self.branch())] = (start, self.repo_state().oid(f'refs/heads/{self.branch()}'))
+      return created
+    else:
+      return True
+
+  def git_discard_created_branch(self):
+    r"""
+    delete the branch created in this run, if nothing is committed on it.
+    where it started is checked out before.
+    return True if deleted
+    """
+    if not (self.enabled() and self.enable_delete_branch()):
+      return False
+    key = (self.local_path(), self.branch())
+    if key not in self._created:
+      return False
+    start, oid = self._created[key]
+    if self.repo_state().oid(f'refs/heads/{self.branch()}') != oid:
+      print(f'branch {self.branch()} has commits, kept.')
+      return False
+    # a detached worktree started at HEAD, main may be checked out by another
+    checkout = ['git', 'checkout', '--detach'] if start == 'HEAD' else ['git', 'checkout', start]
+    if not (self.run_command(checkout) and self.run_command(['git', 'branch', '-D', self.branch()])):
+      return False
+    del self._created[key]
+    self._synced.pop(key, None)
+    return True
+
+  def git_has_staged_changes(self):
+    r"""
+    True if anything is staged to commit
+    """
+    if self.enabled() and self.enable_commit():
+      result = Run.run_capture(self.local_path(), ['git', 'diff', '--cached', '--quiet'])
+      return result.returncode != 0
     else:
       return True
 
@@ -223,7 +406,7 @@ class CommonGit:
   def git_delete_remote_branch(self):
     if self.enabled() and self.enable_delete_branch():
       if self.git_exists_remote_branch():
-        return self.run_command(['git', 'push', self.repo_url(), '--delete', self.branch()])
+        return self.run_stream(['git', 'push', self.repo_url(), '--delete', self.branch()])
       else:
         print(f'remote branch {self.branch()} does not exist.')
         return True
@@ -237,27 +420,48 @@ class CommonGit:
       title = f'{head} to {base}'
       command = ['gh', 'pr', 'create', '--title', title, '--base', base, '--head', head, '--body', body]
 
-      result = self.run_command(command, return_result=True)
+      result = self.run_gh(command, return_result=True)
 
       if result is False:
         print('Failed to create pull request.')
+        self.invalidate_pull_request()
         return False
       elif result.returncode != 0:
         print(f'Error creating pull request: {result.returncode}: {result.stderr.strip()}')
+        self.invalidate_pull_request()
         return False
       else:
-        return result.stdout.strip()
+        out = result.stdout.strip()
+        self.cache_created_pull_request(out, base, head)
+        return out
     else:
       return True
 
+  def cache_created_pull_request(self, out, base, head):
+    r"""
+    cache pull request from url printed by gh pr create
+    """
+    found = re.search(r'https://\S+/pull/(\d+)', out)
+    if found is None:
+      self.invalidate_pull_request()
+    else:
+      self._pull_requests[self.pull_request_key()] = {
+        'number': int(found.group(1)), 'url': found.group(0), 'state': 'OPEN', 'closed': False,
+        'baseRefName': base, 'headRefName': head,
+      }
+
   def git_current_pull_request(self):
     if self.enabled() and self.enable_pull_request():
-      result = self.run_command(
+      key = self.pull_request_key()
+      if key in self._pull_requests:
+        return self._pull_requests[key]
+      result = self.run_gh(
         ['gh', 'pr', 'status',
           '--jq', f'.currentBranch | select(.baseRefName=="{self.main_branch()}" and .state=="OPEN")',
           '--json', 'id,number,url,state,closed,baseRefName,headRefName'
         ], return_result=True)
       parsed_result = json.loads(result.stdout.strip()) if result.returncode == 0 and result.stdout.strip() != '' else {'error': result.returncode}
+      self._pull_requests[key] = parsed_result
       return parsed_result
     else:
       return True
@@ -287,7 +491,15 @@ class CommonGit:
       if pr_number is None:
         pr_number = self.git_current_pull_request_number()
       if pr_number is not None:
-        return self.run_command(['gh', 'pr', 'merge', str(pr_number), '--merge', '--delete-branch'])
+        merged = self.run_gh(['gh', 'pr', 'merge', str(pr_number), '--merge', '--delete-branch'])
+        if merged:
+          # no open pull request anymore, same as gh pr status after merge
+          self._pull_requests[self.pull_request_key()] = {'error': 0}
+          # remote main is changed, sync again on next instance
+          self._synced.pop((self.local_path(), self.branch()), None)
+        else:
+          self.invalidate_pull_request()
+        return merged
       else:
         print('No pull request number provided.')
         return False
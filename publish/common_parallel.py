@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+run jobs in parallel with prefixed output.
+copyright 2026, hanagai
+
+common_parallel.py
+version: October 18, 2026
+"""
+
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+class PrefixedOutput:
+  r"""
+  stdout shared by threads.
+  lines written by a thread with a prefix are prefixed, and never interleaved.
+  """
+
+  def __init__(self, stream):
+    self.stream = stream
+    self._lock = threading.Lock()
+    self._local = threading.local()
+
+  def set_prefix(self, prefix):
+    self._local.prefix = prefix
+    self._local.pending = ''
+
+  def write(self, text):
+    prefix = getattr(self._local, 'prefix', None)
+    if prefix is None:
+      with self._lock:
+        return self.stream.write(text)
+    *lines, self._local.pending = (self._local.pending + text).split('\n')
+    if lines:
+      with self._lock:
+        self.stream.write(''.join(f'{prefix}{line}\n' for line in lines))
+    return len(text)
+
+  def finish(self):
+    r"""
+    write the last line without LF of this thread
+    """
+    if getattr(self._local, 'pending', ''):
+      self.write('\n')
+    self._local.prefix = None
+
+  def flush(self):
+    with self._lock:
+      self.stream.flush()
+
+  def __getattr__(self, name):
+    # fileno, isatty, encoding and so on
+    return getattr(self.stream, name)
+
+class JobResult:
+  r"""
+  result of a job run in parallel.
+  """
+
+  def __init__(self, name):
+    self.name = name
+    self.ok = False
+    self.value = None
+    self.error = None
+    self.elapsed = 0.0
+
+  def __str__(self):
+    status = 'OK' if self.ok else f'FAILED: {self.error!r}'
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.name},'
+      f'{status},'
+      f'{self.elapsed:.1f}s,'
+      f')'
+    )
+
+def run_job(output, prefix, name, func):
+  r"""
+  run a job, catch any exception to isolate failure
+  """
+  result = JobResult(name)
+  output.set_prefix(prefix)
+  start = time.perf_counter()
+  try:
+    result.value = func()
+    result.ok = True
+  except Exception as e:
+    traceback.print_exc(file=sys.stdout)
+    result.error = e
+  finally:
+    result.elapsed = time.perf_counter() - start
+    output.finish()
+  return result
+
+def run_parallel(jobs, max_workers=None):
+  r"""
+  run jobs, list of (name, func), at once.
+  output of each job is prefixed by its name.
+  return list of JobResult in order of jobs.
+  """
+  if len(jobs) == 0:
+    return []
+  width = max(len(name) for name, func in jobs)
+  output = PrefixedOutput(sys.stdout)
+  sys.stdout = output
+  try:
+    with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as executor:
+      futures = [executor.submit(run_job, output, f'[{name:{width}}] ', name, func) for name, func in jobs]
+      return [future.result() for future in futures]
+  finally:
+    sys.stdout = output.stream
+
+def print_results(results):
+  r"""
+  print summary of results
+  """
+  print('=== results ===')
+  for result in results:
+    status = 'OK' if result.ok else f'FAILED: {result.error!r}'
+    print(f'{result.name:10} {result.elapsed:8.1f}s  {status}')
+  print('======')
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  def job(name, seconds, fail=False):
+    def run():
+      for i in range(3):
+        print(f'{name} step {i}')
+        time.sleep(seconds)
+      if fail:
+        raise RuntimeError(f'{name} failed')
+      return name
+    return run
+  results = run_parallel([('base', job('base', 0.1)), ('zenn', job('zenn', 0.2, True)), ('qiita', job('qiita', 0.15))])
+  print_results(results)
+  print([str(result) for result in results])
+
+if __name__ == '__main__':
+  test()
@@ -6,12 +6,13 @@ base class to publish current article
 copyright 2025, hanagai
 
 common_publish.py
-version: May 30, 2025
+version: October 18, 2026
 """
 
 import datetime
 import re
 from conf import *
+import common_trace
 
 class CommonPublish:
     r"""
@@ -59,6 +60,7 @@ class CommonPublish:
         r"""
         notify message
         """
+        common_trace.phase(self.__class__.__name__, message)
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         doc = re.sub(r'\n', '\n-   ', self.__doc__)
         print(f'''---
@@ -156,6 +158,7 @@ class CommonPublish:
         """
         self.notify('Begin')
         repo = f'{self.git().repo_name()}:{self.git().branch()}'
+        gh_count = self.git().gh_count()
 
         if self.no_branch():
             print(f'SKIP: no branch found. Already merged? {repo}')
@@ -170,6 +173,7 @@ class CommonPublish:
 
         self.merge_pull_request()
 
+        print(f'gh invocations: {self.git().gh_count() - gh_count} {repo}')
         self.notify('Done')
 
 
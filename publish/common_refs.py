@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+read refs of a git repository without git command.
+copyright 2026, hanagai
+
+common_refs.py
+version: October 18, 2026
+"""
+
+import os
+import os.path
+
+class UnsupportedRepository(Exception):
+  r"""
+  raised when the repository can not be read natively.
+  caller should fall back to git command.
+  """
+
+class GitRefs:
+  r"""
+  read refs of a git repository without git command.
+  .git/HEAD, loose refs under refs/heads and refs/remotes, packed-refs.
+  .git file of a worktree is followed to its git dir and common dir.
+  """
+
+  OID_LENGTHS = (40, 64) # sha1, sha256
+
+  def __init__(self, local_path):
+    self.local_path = local_path
+    self._dirs = None
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.local_path},'
+      f')'
+    )
+
+  @staticmethod
+  def read_text(path):
+    with open(path, 'r') as f:
+      return f.read().strip()
+
+  def find_git_dir(self):
+    r"""
+    return git dir of local_path, following a `gitdir:` file
+    """
+    path = os.path.abspath(self.local_path)
+    while True:
+      dot_git = os.path.join(path, '.git')
+      if os.path.isdir(dot_git):
+        return dot_git
+      if os.path.isfile(dot_git):
+        content = self.read_text(dot_git)
+        if not content.startswith('gitdir:'):
+          raise UnsupportedRepository(f'unknown .git file: {dot_git}')
+        return os.path.abspath(os.path.join(path, content[len('gitdir:'):].strip()))
+      parent = os.path.dirname(path)
+      if parent == path:
+        raise UnsupportedRepository(f'no git repository: {self.local_path}')
+      path = parent
+
+  def git_dirs(self):
+    r"""
+    return (git dir, common dir), differ in a worktree
+    """
+    if self._dirs is None:
+      git_dir = self.find_git_dir()
+      common_file = os.path.join(git_dir, 'commondir')
+      if os.path.isfile(common_file):
+        common_dir = os.path.abspath(os.path.join(git_dir, self.read_text(common_file)))
+      else:
+        common_dir = git_dir
+      if os.path.exists(os.path.join(common_dir, 'reftable')):
+        raise UnsupportedRepository(f'reftable is not supported: {common_dir}')
+      self._dirs = (git_dir, common_dir)
+    return self._dirs
+
+  def is_oid(self, value):
+    return len(value) in self.OID_LENGTHS and all(c in '0123456789abcdef' for c in value)
+
+  def read_packed_refs(self):
+    r"""
+    return {refname: oid} from packed-refs
+    """
+    git_dir, common_dir = self.git_dirs()
+    refs = {}
+    try:
+      with open(os.path.join(common_dir, 'packed-refs'), 'r') as f:
+        for line in f:
+          if line.startswith('#') or line.startswith('^'):
+            continue # header, peeled tag
+          oid, sep, name = line.rstrip('\n').partition(' ')
+          if not sep or not self.is_oid(oid):
+            raise UnsupportedRepository(f'unknown packed-refs line: {line}')
+          refs[name] = oid
+    except FileNotFoundError:
+      pass
+    return refs
+
+  def read_loose_refs(self, prefixes):
+    r"""
+    return {refname: content} of loose refs under prefixes
+    content is an oid or `ref: ...`
+    """
+    git_dir, common_dir = self.git_dirs()
+    refs = {}
+    for prefix in prefixes:
+      top = os.path.join(common_dir, prefix)
+      for root, dirs, files in os.walk(top):
+        for file in files:
+          if file.endswith('.lock'):
+            continue
+          path = os.path.join(root, file)
+          name = os.path.relpath(path, common_dir).replace(os.sep, '/')
+          refs[name] = self.read_text(path)
+    return refs
+
+  def resolve(self, contents, value, depth=0):
+    r"""
+    resolve a ref content to an oid, None if dangling
+    """
+    if self.is_oid(value):
+      return value
+    if not value.startswith('ref:') or depth > 5:
+      raise UnsupportedRepository(f'unknown ref content: {value}')
+    target = value[len('ref:'):].strip()
+    if target not in contents:
+      return None
+    return self.resolve(contents, contents[target], depth + 1)
+
+  def read(self):
+    r"""
+    return {'head': refname or '', 'head_oid': oid or None, 'oids': {refname: oid}}
+    refs under refs/heads and refs/remotes only
+    """
+    git_dir, common_dir = self.git_dirs()
+    prefixes = ['refs/heads', 'refs/remotes']
+    contents = {name: oid for name, oid in self.read_packed_refs().items() if name.startswith(tuple(f'{prefix}/' for prefix in prefixes))}
+    contents.update(self.read_loose_refs(prefixes)) # loose refs win
+    oids = {}
+    for name, content in contents.items():
+      oid = self.resolve(contents, content)
+      if oid is not None:
+        oids[name] = oid
+
+    head = self.read_text(os.path.join(git_dir, 'HEAD'))
+    if head.startswith('ref:'):
+      head_ref = head[len('ref:'):].strip()
+      head_oid = oids.get(head_ref)
+    elif self.is_oid(head):
+      head_ref = ''
+      head_oid = head
+    else:
+      raise UnsupportedRepository(f'unknown HEAD: {head}')
+    return {'head': head_ref, 'head_oid': head_oid, 'oids': oids}
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  a = GitRefs('.')
+  print(a)
+  print(a.git_dirs())
+  print(a.read())
+  try:
+    print(GitRefs('/').read())
+  except UnsupportedRepository as e:
+    print(f'Caught an exception: {e}')
+
+if __name__ == '__main__':
+  test()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+snapshot of branches in a git repository.
+copyright 2026, hanagai
+
+common_repo_state.py
+version: October 18, 2026
+"""
+
+import os
+import os.path
+import threading
+from common_run import Run
+from common_refs import GitRefs, UnsupportedRepository
+
+class RepoState:
+  r"""
+  snapshot of branches in a git repository.
+  current branch, local and remote branches and HEAD oid.
+  computed once, and again only when .git/HEAD, refs or packed-refs are modified.
+  refs are read natively, git command is used only when not supported.
+  """
+
+  _states = {}
+  _states_lock = threading.Lock()
+
+  @classmethod
+  def of(cls, local_path):
+    r"""
+    return shared state of the repository
+    """
+    with cls._states_lock:
+      if local_path not in cls._states:
+        cls._states[local_path] = cls(local_path)
+      return cls._states[local_path]
+
+  def __init__(self, local_path):
+    self.local_path = local_path
+    self._lock = threading.Lock()
+    self._refs = GitRefs(local_path)
+    self._native = True
+    self._dirs = None
+    self._stamp = None
+    self._snapshot = None
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.local_path},'
+      f'{self.current_branch()},'
+      f'{self.head_oid()},'
+      f')'
+    )
+
+  def git_dirs(self):
+    r"""
+    return (git dir, common dir), differ in a worktree
+    """
+    if self._dirs is None and self._native:
+      try:
+        self._dirs = self._refs.git_dirs()
+      except UnsupportedRepository as e:
+        print(f'WARN: {e}, fall back to git command')
+        self._native = False
+    if self._dirs is None:
+      result = Run.run_capture(self.local_path, ['git', 'rev-parse', '--absolute-git-dir', '--git-common-dir'])
+      git_dir, common_dir = result.stdout.split('\n')[:2]
+      self._dirs = (git_dir, os.path.abspath(os.path.join(self.local_path, common_dir)))
+    return self._dirs
+
+  def stamp(self):
+    r"""
+    mtimes of files and directories which git modifies on ref changes.
+    git writes a ref by renaming a lock file, so the directory mtime changes.
+    """
+    git_dir, common_dir = self.git_dirs()
+    stamp = []
+    for path in [os.path.join(git_dir, 'HEAD'), os.path.join(common_dir, 'packed-refs')]:
+      try:
+        stamp.append(os.stat(path).st_mtime_ns)
+      except FileNotFoundError:
+        stamp.append(None)
+    for refs in ['heads', 'remotes']:
+      for root, dirs, files in os.walk(os.path.join(common_dir, 'refs', refs)):
+        stamp.append((root, os.stat(root).st_mtime_ns))
+    return tuple(stamp)
+
+  def invalidate(self):
+    r"""
+    force to compute again on next access
+    """
+    with self._lock:
+      self._stamp = None
+
+  def compute(self):
+    r"""
+    read branches natively, or from git command
+    """
+    if self._native:
+      try:
+        refs = self._refs.read()
+        return self.make_snapshot(refs['head'], refs['head_oid'], refs['oids'])
+      except (UnsupportedRepository, OSError) as e:
+        print(f'WARN: {e}, fall back to git command')
+        self._native = False
+    return self.compute_git()
+
+  def compute_git(self):
+    r"""
+    read branches from git command
+    """
+    refs = Run.run_capture(self.local_path, ['git', 'for-each-ref', '--format=%(refname) %(objectname)', 'refs/heads', 'refs/remotes'])
+    oids = dict(line.split(' ', 1) for line in refs.stdout.splitlines() if line != '')
+    head = Run.run_capture(self.local_path, ['git', 'symbolic-ref', '-q', 'HEAD'])
+    head_ref = head.stdout.strip()
+    if head_ref != '':
+      head_oid = oids.get(head_ref) # None on unborn branch
+    else:
+      head_oid = Run.run_capture(self.local_path, ['git', 'rev-parse', '-q', '--verify', 'HEAD']).stdout.strip() or None
+    return self.make_snapshot(head_ref, head_oid, oids)
+
+  @staticmethod
+  def make_snapshot(head_ref, head_oid, oids):
+    return {
+      'current_branch': head_ref.removeprefix('refs/heads/'),
+      'local_branches': {ref.removeprefix('refs/heads/') for ref in oids if ref.startswith('refs/heads/')},
+      'remote_branches': {ref.removeprefix('refs/remotes/') for ref in oids if ref.startswith('refs/remotes/')},
+      'head_oid': head_oid,
+      'oids': oids,
+    }
+
+  def snapshot(self):
+    r"""
+    return snapshot, compute again if refs are modified
+    """
+    with self._lock:
+      stamp = self.stamp()
+      if self._stamp != stamp:
+        self._snapshot = self.compute()
+        self._stamp = stamp
+      return self._snapshot
+
+  def current_branch(self):
+    r"""
+    current branch name, empty on detached HEAD
+    """
+    return self.snapshot()['current_branch']
+
+  def local_branches(self):
+    return self.snapshot()['local_branches']
+
+  def remote_branches(self):
+    r"""
+    remote branches as `origin/branch`
+    """
+    return self.snapshot()['remote_branches']
+
+  def head_oid(self):
+    return self.snapshot()['head_oid']
+
+  def oid(self, ref):
+    r"""
+    oid of a full ref name, None if not found
+    """
+    return self.snapshot()['oids'].get(ref)
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  a = RepoState.of('.')
+  print(a)
+  print(a.local_branches())
+  print(a.remote_branches())
+  print(a.snapshot() is a.snapshot())
+  a.invalidate()
+  print(a.head_oid())
+
+if __name__ == '__main__':
+  test()
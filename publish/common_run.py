@@ -6,42 +6,186 @@ run shell command in subprocess
 copyright 2025, hanagai
 
 common_run.py
-version: May 29, 2025
+version: October 18, 2026
 """
 
+import collections
+import queue
 import subprocess
 import sys
+import threading
+import common_trace
 
 class Run:
   @staticmethod
-  def run_command(cwd, command, return_result=False):
+  def span(cwd, command):
+    r"""
+    trace span of a command, exit_code and bytes_out are filled by caller
+    """
+    return common_trace.span(' '.join(command[:2]), 'command', command=' '.join(command), cwd=cwd)
+
+  @staticmethod
+  def size(*texts):
+    return sum(len(text.encode()) for text in texts if text)
+
+  @staticmethod
+  def run_command(cwd, command, return_result=False, input=None):
+    r"""
+    run command and print the output.
+    input is passed to stdin, if given.
+    """
     print(f'at {cwd}')
     print(' '.join(command))
-    try:
-      result = subprocess.run(command, check=True, capture_output=True, text=True, cwd=cwd)
-      print(result.stdout)
-      print(result.returncode)
-      if return_result:
+    with Run.span(cwd, command) as trace:
+      try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True, cwd=cwd, input=input)
+        trace.update(exit_code=result.returncode, bytes_out=Run.size(result.stdout, result.stderr))
+        print(result.stdout)
+        print(result.returncode)
+        if return_result:
+          return result
+        else:
+          return True
+      except subprocess.CalledProcessError as e:
+        trace.update(exit_code=e.returncode, bytes_out=Run.size(e.stdout, e.stderr))
+        print(f'Error: {e}')
+        return False
+
+  @staticmethod
+  def run_direct(cwd, command, stdout=None, stderr=None):
+    r"""
+    run command directly on sys.stdout and sys.stderr, as they are at the call.
+    will be colored, paged.
+    a stream replaced, such as prefixed output of parallel jobs, gets the output captured.
+    """
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+    print(f'at {cwd}')
+    print(' '.join(command))
+    with Run.span(cwd, command) as trace:
+      try:
+        result = subprocess.run(
+          command, check=True, cwd=cwd, text=True, errors='replace',
+          stdout=Run.direct_stream(stdout), stderr=Run.direct_stream(stderr),
+        )
+        trace.update(exit_code=result.returncode)
+        Run.write_captured(result, stdout, stderr)
         return result
-      else:
-        return True
-    except subprocess.CalledProcessError as e:
-      print(f'Error: {e}')
-      return False
+      except subprocess.CalledProcessError as e:
+        trace.update(exit_code=e.returncode)
+        Run.write_captured(e, stdout, stderr)
+        print(f'Error: {e}')
+        raise
+
+  @staticmethod
+  def direct_stream(stream):
+    r"""
+    stream to pass to subprocess as is, or PIPE to capture for a replaced one.
+    a replaced stream may forward fileno to the real one, and bypass itself.
+    """
+    if stream in (sys.__stdout__, sys.__stderr__) or isinstance(stream, int):
+      return stream
+    return subprocess.PIPE
 
   @staticmethod
-  def run_direct(cwd, command, stdout=sys.stdout, stderr=sys.stderr):
+  def write_captured(result, stdout, stderr):
     r"""
-    run command directly on sys.stdout and sys.stderr.
-    will be colored, paged
+    write output captured by direct_stream to the streams
+    """
+    for text, stream in [(result.stdout, stdout), (result.stderr, stderr)]:
+      if text:
+        stream.write(text)
+
+  @staticmethod
+  def run_stream(cwd, command, return_result=False, on_stdout=None, on_stderr=None, tail=100, input=None):
+    r"""
+    run command, reading stdout and stderr line by line while it runs.
+    each line is passed to on_stdout or on_stderr, printed by default.
+    callbacks are called on the calling thread.
+    only the last tail lines of each stream are kept, full text if return_result.
+    return True, CompletedProcess if return_result, or False on error, same as run_command.
     """
     print(f'at {cwd}')
     print(' '.join(command))
+    on_stdout = on_stdout or (lambda line: print(line, end=''))
+    on_stderr = on_stderr or (lambda line: print(line, end=''))
+    with Run.span(cwd, command) as trace:
+      return Run.stream(cwd, command, return_result, on_stdout, on_stderr, tail, input, trace)
+
+  @staticmethod
+  def stream(cwd, command, return_result, on_stdout, on_stderr, tail, input, trace):
+    r"""
+    body of run_stream, in a trace span
+    """
+    process = subprocess.Popen(
+      command, cwd=cwd, text=True, bufsize=1,
+      stdin=subprocess.DEVNULL if input is None else subprocess.PIPE,
+      stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    lines = queue.Queue()
+
+    def read(name, stream):
+      # universal newlines split progress lines ending with CR too
+      with stream:
+        for line in stream:
+          lines.put((name, line))
+      lines.put((name, None))
+
+    def write():
+      with process.stdin:
+        process.stdin.write(input)
+
+    threads = [
+      threading.Thread(target=read, args=('stdout', process.stdout), daemon=True),
+      threading.Thread(target=read, args=('stderr', process.stderr), daemon=True),
+    ]
+    if input is not None:
+      threads.append(threading.Thread(target=write, daemon=True))
+    for thread in threads:
+      thread.start()
+
+    callbacks = {'stdout': on_stdout, 'stderr': on_stderr}
+    kept = {name: [] if return_result else collections.deque(maxlen=tail) for name in callbacks}
+    size = 0
     try:
-      return subprocess.run(command, check=True, cwd=cwd, stdout=stdout, stderr=stderr)
-    except subprocess.CalledProcessError as e:
-      print(f'Error: {e}')
-      raise
+      running = len(callbacks)
+      while running > 0:
+        name, line = lines.get()
+        if line is None:
+          running -= 1
+          continue
+        kept[name].append(line)
+        size += Run.size(line)
+        callbacks[name](line)
+      returncode = process.wait()
+    finally:
+      if process.poll() is None:
+        process.kill()
+        process.wait()
+    for thread in threads:
+      thread.join()
+
+    trace.update(exit_code=returncode, bytes_out=size)
+    print(returncode)
+    result = subprocess.CompletedProcess(command, returncode, ''.join(kept['stdout']), ''.join(kept['stderr']))
+    if returncode != 0:
+      print(f'Error: {subprocess.CalledProcessError(returncode, command)}')
+      return False
+    if return_result:
+      return result
+    else:
+      return True
+
+  @staticmethod
+  def run_capture(cwd, command):
+    r"""
+    run command and return the result without printing.
+    output is buffered by caller, never raises on exit code
+    """
+    with Run.span(cwd, command) as trace:
+      result = subprocess.run(command, capture_output=True, text=True, cwd=cwd)
+      trace.update(exit_code=result.returncode, bytes_out=Run.size(result.stdout, result.stderr))
+      return result
 
 
 # Test function to demonstrate usage
@@ -61,9 +205,17 @@ def test():
   print(Run.run_command('..', ['pwd'], return_result=True))
   print(Run.run_command('.', ['ls', 'not_existing_file'], return_result=True))
   print(Run.run_command('.', ['ls', 'not_existing_file'], return_result=False))
+  print(Run.run_command('.', ['cat'], input='from stdin'))
+
+  print(Run.run_stream('.', ['sh', '-c', 'for i in 1 2 3; do echo out $i; echo err $i >&2; sleep 0.2; done']))
+  print(Run.run_stream('.', ['seq', '1000'], tail=3, on_stdout=lambda line: None))
+  print(Run.run_stream('.', ['cat'], return_result=True, input='from stdin\n'))
+  print(Run.run_stream('.', ['ls', 'not_existing_file']))
 
   print(Run.run_direct('.', ['ls', '-l', '--color=always']))
   print(Run.run_direct('.', ['git', 'diff']))
+  from common_parallel import run_parallel
+  run_parallel([(name, lambda: Run.run_direct('.', ['ls', '-l'])) for name in ['a', 'b']])
   #print(Run.run_direct('.', ['git', 'xxxdiff']))
 
 if __name__ == '__main__':
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+trace commands and phases as Chrome trace JSON.
+copyright 2026, hanagai
+
+common_trace.py
+version: October 18, 2026
+
+enabled only when ARTICLE_TRACE is set:
+  ARTICLE_TRACE=1                 write to tmp/trace_<time>.json
+  ARTICLE_TRACE=/path/trace.json  write to the path
+load the file in chrome://tracing or https://ui.perfetto.dev
+"""
+
+import atexit
+import contextlib
+import datetime
+import json
+import os
+import os.path
+import sys
+import threading
+import time
+
+TRACE_ENV = 'ARTICLE_TRACE'
+
+class Tracer:
+  r"""
+  collect spans in memory, write them once at exit.
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self.pid = os.getpid()
+    self._start = time.perf_counter_ns()
+    self._lock = threading.Lock()
+    self._events = []
+    self._threads = set()
+    self._phases = {} # (tid, name) -> list of start
+    self.add({'ph': 'M', 'name': 'process_name', 'pid': self.pid, 'tid': 0, 'args': {'name': os.path.basename(sys.argv[0]) or 'python'}})
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.path},'
+      f'{len(self._events)},'
+      f')'
+    )
+
+  def now_us(self):
+    return (time.perf_counter_ns() - self._start) / 1000
+
+  def tid(self):
+    r"""
+    current thread id, named on first use
+    """
+    thread = threading.current_thread()
+    tid = thread.ident
+    if tid not in self._threads:
+      self._threads.add(tid)
+      self.add({'ph': 'M', 'name': 'thread_name', 'pid': self.pid, 'tid': tid, 'args': {'name': thread.name}})
+    return tid
+
+  def add(self, event):
+    with self._lock:
+      self._events.append(event)
+
+  def complete(self, name, category, start, args):
+    r"""
+    add a span from start to now
+    """
+    self.add({
+      'ph': 'X', 'name': name, 'cat': category, 'pid': self.pid, 'tid': self.tid(),
+      'ts': start, 'dur': self.now_us() - start, 'args': args,
+    })
+
+  @contextlib.contextmanager
+  def span(self, name, category, **args):
+    r"""
+    record a span around the block.
+    yielded args can be filled in the block, such as exit code.
+    """
+    start = self.now_us()
+    try:
+      yield args
+    except BaseException as e:
+      args['exception'] = repr(e)
+      raise
+    finally:
+      self.complete(name, category, start, args)
+
+  def phase(self, name, message):
+    r"""
+    Begin starts a phase, Done ends it, others are instant events
+    """
+    key = (self.tid(), name)
+    if message == 'Begin':
+      with self._lock:
+        self._phases.setdefault(key, []).append(self.now_us())
+    elif message == 'Done' and self._phases.get(key):
+      with self._lock:
+        start = self._phases[key].pop()
+      self.complete(name, 'phase', start, {})
+    else:
+      self.add({'ph': 'i', 's': 't', 'name': f'{name}: {message}', 'cat': 'phase', 'pid': self.pid, 'tid': self.tid(), 'ts': self.now_us()})
+
+  def close_phases(self):
+    r"""
+    end phases not done, such as on an exception
+    """
+    with self._lock:
+      phases = [(key, start) for key, starts in self._phases.items() for start in starts]
+      self._phases = {}
+    for (tid, name), start in phases:
+      self.add({
+        'ph': 'X', 'name': name, 'cat': 'phase', 'pid': self.pid, 'tid': tid,
+        'ts': start, 'dur': self.now_us() - start, 'args': {'done': False},
+      })
+
+  def dump(self):
+    r"""
+    write trace file
+    """
+    self.close_phases()
+    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+    with self._lock:
+      events = list(self._events)
+    with open(self.path, 'w') as f:
+      json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    print(f'trace: {self.path} ({len(events)} events)', file=sys.stderr)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def trace_path(value):
+  r"""
+  path of trace file from ARTICLE_TRACE
+  """
+  if value in ('1', 'true', 'yes'):
+    from conf import conf_dirs
+    now = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(conf_dirs.TMP, f'trace_{now}_{os.getpid()}.json')
+  return value
+
+def tracer():
+  r"""
+  shared tracer, None if not enabled
+  """
+  global _tracer
+  value = os.environ.get(TRACE_ENV, '')
+  if value in ('', '0'):
+    return None
+  with _tracer_lock:
+    if _tracer is None:
+      _tracer = Tracer(trace_path(value))
+      atexit.register(_tracer.dump)
+    return _tracer
+
+def span(name, category, **args):
+  r"""
+  record a span if enabled, otherwise yield args only
+  """
+  current = tracer()
+  if current is None:
+    return contextlib.nullcontext(args)
+  return current.span(name, category, **args)
+
+def phase(name, message):
+  r"""
+  record notify message as a phase if enabled
+  """
+  current = tracer()
+  if current is not None:
+    current.phase(name, message)
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  os.environ.setdefault(TRACE_ENV, '/tmp/trace_test.json')
+  phase('test', 'Begin')
+  with span('sleep', 'test', seconds=0.1) as args:
+    time.sleep(0.1)
+    args['done'] = True
+  def worker():
+    with span('worker', 'test'):
+      time.sleep(0.05)
+  thread = threading.Thread(target=worker, name='worker')
+  thread.start()
+  thread.join()
+  phase('test', 'halfway')
+  phase('test', 'Done')
+  phase('test', 'Begin')
+  print(tracer())
+
+if __name__ == '__main__':
+  test()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+transform base markdown for zenn and qiita in one pass.
+copyright 2026, hanagai
+
+common_transform.py
+version: October 18, 2026
+
+lines in fenced code blocks are passed as is.
+each transform takes a line and returns lines, so a line may become several.
+"""
+
+import os.path
+import posixpath
+import re
+import time
+
+FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+CONTAINER = re.compile(r'^ {0,3}(:{3,})\s*(\w*)\s*(.*?)\s*$')
+HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+INLINE_CODE = re.compile(r'(`+).+?\1')
+LINK = re.compile(r'(!?\[[^\]]*\]\()([^)\s]+)((?:\s+"[^"]*")?\))')
+
+class Transform:
+  r"""
+  a transform of lines, state is kept until reset
+  """
+
+  name = 'identity'
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.name},'
+      f')'
+    )
+
+  def reset(self):
+    r"""
+    clear state before a document
+    """
+    pass
+
+  def line(self, line):
+    r"""
+    return list of lines for a line, without line end
+    """
+    return [line]
+
+  def end(self):
+    r"""
+    return list of lines at the end of document
+    """
+    return []
+
+class Containers(Transform):
+  r"""
+  rename `:::kind` containers of zenn and qiita, closed by `:::` of the same colons.
+  kinds: {kind: function(kind, rest) -> (opener, closer)}, closer None keeps `:::`
+  """
+
+  name = 'containers'
+
+  def __init__(self, kinds):
+    self.kinds = kinds
+    self._stack = []
+
+  def reset(self):
+    self._stack = []
+
+  def line(self, line):
+    if not line.lstrip(' ').startswith(':::'):
+      return [line]
+    matched = CONTAINER.match(line)
+    if matched is None:
+      return [line]
+    colons, kind, rest = matched.groups()
+    if kind == '' and rest == '':
+      # closer of the innermost container opened with the same colons
+      for index in range(len(self._stack) - 1, -1, -1):
+        if self._stack[index][0] == colons:
+          closer = self._stack[index][1]
+          del self._stack[index:]
+          return [colons] if closer is None else closer
+      return [line]
+    if kind in self.kinds:
+      opener, closer = self.kinds[kind](kind, rest)
+      self._stack.append((colons, closer))
+      return [f'{colons}{opener}'] if isinstance(opener, str) else opener
+    self._stack.append((colons, None))
+    return [line]
+
+  def end(self):
+    r"""
+    close html of containers not closed
+    """
+    lines = []
+    for colons, closer in reversed(self._stack):
+      if closer is not None:
+        lines.extend(closer)
+    self._stack = []
+    return lines
+
+def message_to_note(kind, rest):
+  r"""
+  zenn `:::message [alert]` to qiita `:::note info|alert`
+  """
+  return f'note {"alert" if rest == "alert" else "info"}', None
+
+def note_to_message(kind, rest):
+  r"""
+  qiita `:::note info|warn|alert` to zenn `:::message [alert]`
+  """
+  return 'message alert' if rest == 'alert' else 'message', None
+
+def details_to_html(kind, rest):
+  r"""
+  zenn `:::details title` to html details, qiita has no container for it
+  """
+  return ['<details>', f'<summary>{rest}</summary>', ''], ['', '</details>']
+
+def zenn_containers():
+  return Containers({'note': note_to_message})
+
+def qiita_containers():
+  return Containers({'message': message_to_note, 'details': details_to_html})
+
+class MediaLinks(Transform):
+  r"""
+  relative links to files in docs to urls of github pages, as base_add_media makes.
+  links in inline code are kept.
+  """
+
+  name = 'media_links'
+
+  def __init__(self, io_url, doc_dir, docs_root):
+    # io_url: url of github pages, docs_root is published at
+    # doc_dir: directory of the document
+    # docs_root: docs directory of base
+    self.io_url = io_url
+    self.relative_dir = os.path.relpath(doc_dir, docs_root).replace(os.sep, '/')
+
+  def url(self, target):
+    r"""
+    url of a relative target, None if out of docs or not relative
+    """
+    if re.match(r'^([a-z][a-z0-9+.-]*:|/|#)', target, re.IGNORECASE):
+      return None
+    path = posixpath.normpath(posixpath.join(self.relative_dir, target))
+    if path.startswith('../') or path == '..':
+      return None
+    return f'{self.io_url}{path}'
+
+  def replace(self, text):
+    def link(matched):
+      url = self.url(matched.group(2))
+      return matched.group(0) if url is None else f'{matched.group(1)}{url}{matched.group(3)}'
+    return LINK.sub(link, text)
+
+  def line(self, line):
+    if '](' not in line:
+      return [line]
+    parts = []
+    last = 0
+    for code in INLINE_CODE.finditer(line):
+      parts.append(self.replace(line[last:code.start()]))
+      parts.append(code.group(0))
+      last = code.end()
+    parts.append(self.replace(line[last:]))
+    return [''.join(parts)]
+
+class Headings(Transform):
+  r"""
+  normalize atx headings: `##  title ##` to `## title`, shifted by levels
+  """
+
+  name = 'headings'
+
+  def __init__(self, shift=0):
+    self.shift = shift
+
+  def line(self, line):
+    if '#' not in line[:4]:
+      return [line]
+    matched = HEADING.match(line)
+    if matched is None:
+      return [line]
+    hashes, text = matched.groups()
+    level = min(max(len(hashes) + self.shift, 1), 6)
+    return [f'{"#" * level} {text}' if text else '#' * level]
+
+class Pipeline:
+  r"""
+  ordered transforms run in one pass, with time and lines changed for each
+  """
+
+  def __init__(self, transforms):
+    self.transforms = transforms
+    self.seconds = {transform.name: 0.0 for transform in transforms}
+    self.changed = {transform.name: 0 for transform in transforms}
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{[transform.name for transform in self.transforms]},'
+      f')'
+    )
+
+  def apply(self, index, lines):
+    r"""
+    apply transforms from index to lines
+    """
+    for transform in self.transforms[index:]:
+      start = time.perf_counter()
+      applied = []
+      for line in lines:
+        result = transform.line(line)
+        if result != [line]:
+          self.changed[transform.name] += 1
+        applied.extend(result)
+      self.seconds[transform.name] += time.perf_counter() - start
+      lines = applied
+    return lines
+
+  def run(self, lines):
+    r"""
+    iterate transformed lines of iterable lines, line ends are kept
+    """
+    for transform in self.transforms:
+      transform.reset()
+    fence = None
+    end = '\n'
+    for line in lines:
+      text = line.rstrip('\r\n')
+      end = line[len(text):]
+      matched = FENCE.match(text)
+      if fence is not None:
+        if matched and matched.group(1)[0] == fence[0] and len(matched.group(1)) >= len(fence) and text.strip() == matched.group(1):
+          fence = None
+        yield line
+        continue
+      if matched and not (matched.group(1)[0] == '`' and '`' in text[matched.end():]):
+        fence = matched.group(1)
+        yield line
+        continue
+      results = self.apply(0, [text])
+      for result in results[:-1]:
+        yield f'{result}{end or chr(10)}'
+      if results:
+        yield f'{results[-1]}{end}'
+    for index, transform in enumerate(self.transforms):
+      results = self.apply(index + 1, transform.end())
+      if results and end == '':
+        # the last line had no line end
+        yield '\n'
+        end = '\n'
+      for result in results:
+        yield f'{result}{end}'
+
+  def text(self, content):
+    r"""
+    transform whole content
+    """
+    return ''.join(self.run(content.splitlines(keepends=True)))
+
+  def report(self):
+    r"""
+    print time and lines changed for each transform
+    """
+    for transform in self.transforms:
+      print(f'transform: {transform.name:12} {self.seconds[transform.name] * 1000:8.2f}ms {self.changed[transform.name]:6} lines changed')
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  content = '''# title
+
+:::message alert
+be careful
+:::
+
+:::details open me
+::::message
+inside
+::::
+:::
+
+```python
+:::message
+# not a heading ##
+```
+
+##   heading with closing ##
+![a](../medib/a.png) `![b](../medib/b.png)` [c](https://example.com/c.png)
+'''
+  for transforms in [
+    [zenn_containers(), MediaLinks('https://nyosak.github.io/article-base-doc/', 'docs/b', 'docs'), Headings()],
+    [qiita_containers(), MediaLinks('https://nyosak.github.io/article-base-doc/', 'docs/b', 'docs'), Headings()],
+  ]:
+    pipeline = Pipeline(transforms)
+    print(pipeline)
+    print(pipeline.text(content))
+    pipeline.report()
+  large = content * 20000
+  pipeline = Pipeline([qiita_containers(), MediaLinks('https://x/', 'docs/b', 'docs'), Headings()])
+  start = time.perf_counter()
+  pipeline.text(large)
+  print(f'{len(large)} chars in {time.perf_counter() - start:.2f}s')
+  pipeline.report()
+
+if __name__ == '__main__':
+  test()
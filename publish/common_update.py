@@ -6,23 +6,35 @@ base class to create and update an article file from base.
 copyright 2025, hanagai
 
 common_update.py
-version: June 8, 2025
+version: October 18, 2026
 """
 
 import re
 import datetime
+import hashlib
+import json
 import os.path
+import stat
 from conf import *
+import common_trace
+import common_transform
 from common_run import Run
+from common_document import ArticleDocument
+
+USE_NPX_ENV = 'ARTICLE_USE_NPX'
 
 class CommonUpdate:
     r"""
     base class to create and update an article file from base.
     """
 
+    # bump when the rendered document changes for the same inputs
+    RENDERER_VERSION = 3
+
     dry_run = False
     no_git = False
     pager = True
+    use_npx = False
     current = {}
     _git = None
     _git_diff = None
@@ -77,7 +89,7 @@ class CommonUpdate:
         #return ['npx', 'qiita', 'new', article]
         return ['echo', 'npx', 'zenn/qiita', 'new_something', article]
 
-    def create_meta_head(article_pathself, article_path=None):
+    def create_meta_head(self, current=None):
         r"""
         create meta information string of current article
         """
@@ -122,11 +134,35 @@ created: {esc_in}articles/{expected_md}{esc_out}
         #out = "Error: 'hoge.md' is already exist"
         return out
 
+    def new_stub(self, article_name):
+        r"""
+        (path relative to local repo, content) of a new article, as command_new creates
+        """
+        return f'{article_name}.md', '---\n---\n'
+
+    def validate_new_name(self, article_name):
+        r"""
+        raise ValueError if the name is not allowed by the platform
+        """
+        if article_name == '' or '/' in article_name:
+            message = f'Error: invalid article name: {article_name}'
+            print(message)
+            raise ValueError(message)
+
+    def transforms(self):
+        r"""
+        transforms of base md, in order
+        """
+        return []
+
     def transform_doc_md(self, content):
         r"""
         transform md
         """
-        return content
+        pipeline = common_transform.Pipeline(self.transforms())
+        transformed = pipeline.text(content)
+        pipeline.report()
+        return transformed
 
 
     r"""
@@ -144,13 +180,15 @@ created: {esc_in}articles/{expected_md}{esc_out}
             yaml[key] = conf_current.get_current(key)
         return yaml
 
-    def __init__(self, dry_run=False, no_git=False, pager=True):
+    def __init__(self, dry_run=False, no_git=False, pager=True, use_npx=None):
         # dry_run disables file writing and git
         # no_git disables git only
         # pager disables git diff pager when False
+        # use_npx creates a new article by npx, ARTICLE_USE_NPX=1 by default
         self.dry_run = dry_run
         self.no_git = no_git
         self.pager = pager
+        self.use_npx = use_npx if use_npx is not None else os.environ.get(USE_NPX_ENV, '') not in ('', '0')
         self.current = self.get_current()
 
     def __str__(self):
@@ -194,90 +232,87 @@ created: {esc_in}articles/{expected_md}{esc_out}
         r"""
         create a new article by specified name
         """
+        if self.use_npx:
+            self.create_a_new_article_by_npx(article_name)
+            return
+        self.validate_new_name(article_name)
+        relative, content = self.new_stub(article_name)
+        path = os.path.join(self.local_path(), relative)
+        if self.dry_run:
+            print(f'DRY_RUN: skipping creating new article file.\n{relative}')
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            # fails if exists, same as npx
+            with open(path, 'x') as file:
+                file.write(content)
+        except FileExistsError:
+            message = f"Error: '{os.path.basename(path)}' is already exist"
+            print(message)
+            raise ValueError(message)
+        print(f'created: {relative}')
+
+    def create_a_new_article_by_npx(self, article_name):
+        r"""
+        create a new article by npx, output is parsed to validate
+        """
         expected_md = f'{article_name}.md'
         command = self.command_new(article_name)
         if self.dry_run:
             created = self.example_stdout_at_new(expected_md)
             print(f'DRY_RUN: skipping creating new article file.\n{command}')
         else:
-            result = Run.run_command(self.local_path(), command, return_result=True)
-            print(result.returncode)
-            print(result.stderr)
-            print(result.stdout)
+            # output is shown while npx runs
+            result = Run.run_stream(self.local_path(), command, return_result=True)
             created = result.stdout
 
         created_name = self.extract_name_created(created)
         self.validate_name_created(expected_md, created_name)
 
-    def remove_doc(self, article_path):
+    def read_current(self, article_path):
         r"""
-        remove document body from current article
+        read current article at once, to reuse its head and diff with the new one.
+        return ArticleDocument
         """
-        # remove lines after the 2nd `---`
         if self.dry_run:
-            print(f'DRY_RUN: skipping remove document from {article_path}')
-        else:
-            with open(article_path, 'r') as file:
-                current_content = file.readlines()
-
-            # check the 1st
-            if not self.is_separator_line(current_content[0]):
-                message = f'Error: broken content. 1st line must be a separator. {current_content[0]}'
-                print(message)
-                raise ValueError(message)
-
-            # search the 2nd
-            head_content = [current_content[0]]
-            detected = False
-            for line in current_content[1:]:
-                head_content.append(line)
-                if self.is_separator_line(line):
-                    detected = True
-                    print('2nd separator is detected.')
-                    break
-
-            # it still allows head only document (blank new),
-            # but a head only one also has the 2nd separator.
-            if not detected:
-                message = f'Error: broken content. No 2nd separator.'
-                print(head_content)
-                print(message)
-                raise ValueError(message)
-
-            # overwrite the document with head
-            with open(article_path, 'w') as file:
-                file.writelines(head_content)
-
-    def update_doc(self, article_path, base_doc):
-        r"""
-        insert base_doc into current article
+            print(f'DRY_RUN: skipping read {article_path}')
+            return None
+
+        current = ArticleDocument.read(article_path)
+        current.validate_head()
+        print('2nd separator is detected.')
+        return current
+
+    def read_base_doc(self, base_doc):
+        r"""
+        read base document, transformed for current article
         """
-        if self.dry_run:
-            print(f'DRY_RUN: skipping append {base_doc} to {article_path}')
-        else:
-            with open(base_doc, 'r') as base_file:
-                base_content = base_file.read()
-                with open(article_path, 'a') as file:
-                    file.write(self.transform_doc_md(base_content))
+        with open(base_doc, 'r') as base_file:
+            return self.transform_doc_md(base_file.read())
+
+    def build_document(self, current, base_doc):
+        r"""
+        (new meta, whole text) of current article, from new meta and base document
+        """
+        meta = self.create_meta_head(current)
+        return meta, meta + self.read_base_doc(base_doc)
 
-    def update_meta(self, article_path):
+    def write_document(self, article_path, text):
         r"""
-        update meta information of current article
+        write current article at once, by a temporary file and rename
         """
-        meta = self.create_meta_head(article_path)
         if self.dry_run:
-            print(f'DRY_RUN: skipping update meta information')
+            print(f'DRY_RUN: skipping write {article_path}')
         else:
-            with open(article_path, 'w') as file:
-                file.write(meta)
+            mode = stat.S_IMODE(os.stat(article_path).st_mode) if os.path.exists(article_path) else 0o644
+            conf_current.write_atomic(article_path, text, mode=mode)
 
     def new_article(self):
         r"""
         create a new article document
         """
         article_name = self.article_name()
-        # caution: zenn changes this name on every call.
-        # sure to use this local variable before file creation.
+        # zenn reserves a new name until the file is created.
 
         self.create_a_new_article(article_name)
 
@@ -288,7 +323,7 @@ created: {esc_in}articles/{expected_md}{esc_out}
         if self.dry_run or self.no_git:
             print('DRY_RUN: skipping git add')
         else:
-            self.git().git_add(article_path)
+            self.git().git_add_files([article_path])
 
         return True
 
@@ -299,65 +334,124 @@ created: {esc_in}articles/{expected_md}{esc_out}
         article_path = self.article_path()
         base_doc = conf_current.a_path()
 
-        self.print_file_head(article_path, 'BEFORE')
+        current = self.read_current(article_path)
+        if current is not None:
+            self.print_head(current, article_path, 'BEFORE')
 
-        self.remove_doc(article_path)
-        self.print_file_head(article_path, 'AFTER REMOVE BODY')
+        meta, new = self.build_document(current, base_doc)
+        self.print_head(ArticleDocument.parse(meta), article_path, 'AFTER UPDATE')
 
-        self.update_meta(article_path)
-        self.print_file_head(article_path, 'AFTER UPDATE META')
-
-        self.update_doc(article_path, base_doc)
-        self.print_file_head(article_path, 'AFTER UPDATE DOC')
+        old = current.text() if current is not None else None
+        if old == new:
+            print(f'not changed, skipping write {article_path}')
+        else:
+            self.write_document(article_path, new)
 
         if self.dry_run or self.no_git:
             print('DRY_RUN: skipping git add')
         else:
             #self.git().git_add(article_path)
             # no path is needed because it was already added at new
-            self.git_diff().diff_and_add()
+            self.git_diff().diff_and_add(article_path, new)
 
     def commit_and_push(self, message):
         r"""
         git commit and push
+        nothing to commit is not an error, the branch created for it is discarded.
+        return True if pushed, or nothing to push
         """
         article_name = self.article_name()
         if self.dry_run or self.no_git:
             print('DRY_RUN: skipping git commit, push')
+            return False
+        elif not self.git().git_has_staged_changes():
+            print(f'nothing to commit: {article_name}')
+            if self.git().git_discard_created_branch():
+                print(f'SKIP: nothing to push, branch discarded. {self.git().branch()}')
+                return True
+            return self.git().git_push()
         else:
             self.git().git_commit(f'{message}{article_name}')
-            self.git().git_push()
+            return self.git().git_push()
+
+    def target(self):
+        r"""
+        target name in manifest, repository name
+        """
+        return os.path.basename(self.local_path())
+
+    def input_hash(self):
+        r"""
+        hash of everything the update reads, except current article itself
+        """
+        digest = hashlib.sha256()
+        digest.update(f'{self.__class__.__name__}:{self.RENDERER_VERSION}\n'.encode())
+        digest.update(json.dumps(self.current, sort_keys=True, ensure_ascii=False).encode())
+        digest.update(f'\n{os.path.basename(self.article_path())}\n'.encode())
+        with open(conf_current.a_path(), 'rb') as file:
+            digest.update(file.read())
+        return digest.hexdigest()
+
+    def output_hash(self):
+        r"""
+        hash of current article, None if not exists
+        """
+        article_path = self.article_path()
+        if not os.path.exists(article_path):
+            return None
+        with open(article_path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def is_unchanged(self):
+        r"""
+        True if inputs and current article are the same as the last update
+        """
+        recorded = conf_current.manifest().get(self.current['key'], self.target())
+        if recorded is None:
+            return False
+        inputs, output = recorded
+        return inputs == self.input_hash() and output == self.output_hash()
+
+    def remember(self):
+        r"""
+        record hashes of the update, only when current article is committed
+        """
+        article_path = self.article_path()
+        status = Run.run_capture(self.local_path(), ['git', 'status', '--porcelain', '--', article_path])
+        if status.returncode != 0 or status.stdout.strip() != '':
+            print(f'not recorded in manifest, not committed: {article_path}')
+            return
+        conf_current.manifest().put(self.current['key'], self.target(), self.input_hash(), self.output_hash())
 
     def is_yaml_key(self, line, keys):
         r"""
         return True if line has any of keys as yaml key
         """
-        pattern = re.compile('|'.join([f'^{k}:' for k in keys]))
-        return True if re.search(pattern, line) else False
+        return conf_meta.is_yaml_key(line, keys)
 
     def is_yaml_array(self, line):
         r"""
         return True if line is ` - ` including white spaces
         """
-        return True if re.search(r'^\s+-\s', line) else False
+        return conf_meta.classify(line)[0] == conf_meta.YAML_ARRAY
 
     def is_blank(self, line):
         r"""
         return True if line is blank including white spaces
         """
-        return True if re.search(r'^\s*$', line) else False
+        return conf_meta.classify(line)[0] == conf_meta.BLANK
 
     def is_h1(self, line):
         r"""
         return True if line is `# ` including white spaces
         """
-        return True if re.search(r'^\s*#\s', line) else False
+        return conf_meta.classify(line)[0] == conf_meta.H1
 
     def is_tri_hyphen(self, line):
         r"""
         return True if line is `---` and may includes LF
         """
-        return '---' == line.rstrip()
+        return conf_meta.classify(line)[0] == conf_meta.SEPARATOR
 
     def is_separator_line(self, line):
         r"""
@@ -365,6 +459,16 @@ created: {esc_in}articles/{expected_md}{esc_out}
         """
         return self.is_tri_hyphen(line)
 
+    def print_head(self, document, path, message=''):
+        r"""
+        print ArticleDocument until the 1st `# line` detected
+        """
+        print(f'=== {message}: {os.path.relpath(path, self.local_path())} ===')
+        lines, truncated = document.until_h1()
+        for line in lines:
+            print(line.rstrip())
+        print(f"==={' Truncated ' if truncated else ''}===")
+
     def print_file_head(self, path, message=''):
         r"""
         print file content until the 1st `# line` detected
@@ -402,6 +506,7 @@ created: {esc_in}articles/{expected_md}{esc_out}
         r"""
         notify message
         """
+        common_trace.phase(self.__class__.__name__, message)
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         doc = re.sub(r'\n', '\n-   ', self.__doc__)
         print(f'''---
@@ -420,7 +525,8 @@ created: {esc_in}articles/{expected_md}{esc_out}
         self.new_article()
         self.commit_and_push('new article: ')
         self.update_from_base()
-        self.commit_and_push('update from base: ')
+        if self.commit_and_push('update from base: '):
+            self.remember()
 
         self.notify('Done')
 
@@ -430,9 +536,16 @@ created: {esc_in}articles/{expected_md}{esc_out}
         """
         self.notify('Begin')
 
+        # before git, nothing to do when inputs are not changed
+        if self.is_unchanged():
+            print(f'SKIP: no change since the last update. {self.target()}:{self.current["key"]}')
+            self.notify('Done')
+            return
+
         print(self.git())
         self.update_from_base()
-        self.commit_and_push('update from base: ')
+        if self.commit_and_push('update from base: '):
+            self.remember()
 
         self.notify('Done')
 
@@ -458,7 +571,7 @@ def test3(cls):
     print(a.article_name())
     print(a.article_path())
     print(a.command_new('my_article-123'))
-    print(a.create_meta_head(article_path))
+    print(a.create_meta_head())
     print(a.example_stdout_at_new('my_expected.md'))
 
 def test4(cls):
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+watch files for changes, inotify or polling.
+copyright 2026, hanagai
+
+common_watch.py
+version: October 18, 2026
+
+directories are watched rather than files,
+editors often save by writing a new file and renaming it.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import os.path
+import select
+import struct
+import sys
+import time
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+EVENT = struct.Struct('iIII')
+MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+class PollingWatcher:
+  r"""
+  watch files by mtime and size, every interval seconds
+  """
+
+  name = 'polling'
+
+  def __init__(self, paths, interval=0.25):
+    self.paths = [os.path.abspath(path) for path in paths]
+    self.interval = interval
+    self._stats = {path: self.stat(path) for path in self.paths}
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{len(self.paths)},'
+      f'{self.interval},'
+      f')'
+    )
+
+  @staticmethod
+  def stat(path):
+    try:
+      result = os.stat(path)
+      return result.st_mtime_ns, result.st_size
+    except OSError:
+      return None
+
+  def changes(self, timeout):
+    r"""
+    wait until files changed or timeout, return set of changed paths
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+      changed = set()
+      for path in self.paths:
+        stat = self.stat(path)
+        if stat != self._stats[path]:
+          self._stats[path] = stat
+          changed.add(path)
+      if changed:
+        return changed
+      left = deadline - time.monotonic()
+      if left <= 0:
+        return changed
+      time.sleep(min(self.interval, left))
+
+  def close(self):
+    pass
+
+class InotifyWatcher:
+  r"""
+  watch files by inotify on their directories, linux only
+  """
+
+  name = 'inotify'
+
+  def __init__(self, paths):
+    self.paths = {os.path.abspath(path) for path in paths}
+    self._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+    self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if self._fd < 0:
+      raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+    self._dirs = {}
+    for directory in sorted({os.path.dirname(path) for path in self.paths}):
+      wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), MASK)
+      if wd < 0:
+        error = ctypes.get_errno()
+        self.close()
+        raise OSError(error, f'inotify_add_watch failed: {directory}')
+      self._dirs[wd] = directory
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{len(self.paths)},'
+      f'{sorted(self._dirs.values())},'
+      f')'
+    )
+
+  def read_events(self):
+    r"""
+    return set of watched paths in pending events
+    """
+    changed = set()
+    while True:
+      try:
+        data = os.read(self._fd, 65536)
+      except BlockingIOError:
+        return changed
+      offset = 0
+      while offset < len(data):
+        wd, mask, cookie, length = EVENT.unpack_from(data, offset)
+        offset += EVENT.size
+        name = data[offset:offset + length].rstrip(b'\0')
+        offset += length
+        path = os.path.join(self._dirs.get(wd, ''), os.fsdecode(name))
+        if path in self.paths:
+          changed.add(path)
+
+  def changes(self, timeout):
+    r"""
+    wait until files changed or timeout, return set of changed paths
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+      left = deadline - time.monotonic()
+      if left <= 0:
+        return set()
+      readable, _, _ = select.select([self._fd], [], [], left)
+      if readable:
+        changed = self.read_events()
+        if changed:
+          return changed
+
+  def close(self):
+    if self._fd >= 0:
+      os.close(self._fd)
+      self._fd = -1
+
+def watcher(paths, polling=False, interval=0.25):
+  r"""
+  inotify watcher, or polling one if not available
+  """
+  if not polling and sys.platform.startswith('linux'):
+    try:
+      return InotifyWatcher(paths)
+    except (OSError, AttributeError) as e:
+      print(f'inotify is not available, polling: {e}')
+  return PollingWatcher(paths, interval)
+
+def debounced(watcher, timeout, quiet):
+  r"""
+  wait for changes, then collect more until quiet seconds passed without change
+  """
+  changed = watcher.changes(timeout)
+  while changed:
+    more = watcher.changes(quiet)
+    if not more:
+      break
+    changed |= more
+  return changed
+
+
+# Test function to demonstrate usage
+def test():
+  print('test launched manually.')
+  import tempfile
+  import threading
+  directory = tempfile.mkdtemp()
+  path = os.path.join(directory, 'a.md')
+  with open(path, 'w') as f:
+    f.write('a')
+  for w in [watcher([path]), PollingWatcher([path], 0.05)]:
+    print(w)
+    def touch():
+      time.sleep(0.1)
+      for n in range(3):
+        # write and rename, as editors do
+        with open(f'{path}.tmp', 'w') as f:
+          f.write(f'b{n}')
+        os.replace(f'{path}.tmp', path)
+        time.sleep(0.02)
+    thread = threading.Thread(target=touch)
+    thread.start()
+    start = time.monotonic()
+    print(debounced(w, 2, 0.2), f'{time.monotonic() - start:.2f}s')
+    thread.join()
+    print(debounced(w, 0.3, 0.1), 'nothing expected')
+    w.close()
+
+if __name__ == '__main__':
+  test()
@@ -7,10 +7,10 @@ definitions
 copyright 2025, hanagai
 
 conf/__init__.py
-version: May 22, 2025
+version: October 18, 2026
 """
 
-__all__ = ['conf_dirs', 'conf_current']
+__all__ = ['conf_dirs', 'conf_current', 'conf_index', 'conf_tags', 'conf_meta']
 
 def test():
   print('test launched manually.')
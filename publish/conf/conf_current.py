@@ -7,19 +7,28 @@ current settings
 copyright 2025, hanagai
 
 conf/conf_current.py
-version: June 8, 2025
+version: October 18, 2026
 """
 
+import os
 import os.path
 from pathlib import Path
-import re
 import datetime
+import fcntl
 import random
+import json
+import tempfile
 
 if __name__ == '__main__':
     import conf_dirs
+    import conf_index
+    import conf_tags
+    import conf_meta
 else:
     from conf import conf_dirs
+    from conf import conf_index
+    from conf import conf_tags
+    from conf import conf_meta
 
 TMP = conf_dirs.TMP
 BASE = conf_dirs.BASE
@@ -28,32 +37,108 @@ QIITA = conf_dirs.QIITA
 Q_DOC = os.path.join(QIITA, 'public')
 ZENN = conf_dirs.ZENN
 Z_DOC = os.path.join(ZENN, 'articles')
+META_INDEX = os.path.join(TMP, 'meta_index.sqlite3')
+SLUG_INDEX = os.path.join(TMP, 'zenn_slugs.sqlite3')
+# batch runs on worktrees share the manifest of the main tree
+MANIFEST_ENV = 'ARTICLE_MANIFEST'
+MANIFEST = os.environ.get(MANIFEST_ENV) or os.path.join(TMP, 'update_manifest.sqlite3')
+STATE = os.path.join(TMP, 'current.json')
+STATE_VERSION = 1
+
+_meta_index = None
+_slug_index = None
+_manifest = None
+_state_cache = {'mtime': None, 'values': None}
 
 def current_setting_file_name(name):
     r"""
-    get current setting file name
+    get legacy current setting file name
     """
     return os.path.join(TMP, f'current_{name}')
 
+def read_legacy_state():
+    r"""
+    read legacy current settings, tmp/current_*
+    """
+    values = {}
+    prefix = current_setting_file_name('')
+    for file in sorted(Path(TMP).glob('current_*')):
+        if file.is_file():
+            values[str(file)[len(prefix):]] = file.read_text().strip()
+    return values
+
+def read_state():
+    r"""
+    read all current settings
+    memoized until the state file is modified
+    """
+    try:
+        mtime = os.stat(STATE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    if _state_cache['values'] is not None and _state_cache['mtime'] == mtime:
+        return _state_cache['values']
+
+    if mtime is None:
+        values = read_legacy_state()
+    else:
+        with open(STATE, 'r') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f'Unknown state version {state.get("version")} in {STATE}')
+        values = state['current']
+    _state_cache['mtime'] = mtime
+    _state_cache['values'] = values
+    return values
+
+def write_atomic(path, content, mode=None):
+    r"""
+    write content to path atomically
+    by a temporary file and rename, with mode if given
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(temp, mode)
+        os.replace(temp, path)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
 def get_current(name):
     r"""
     get current settings
     """
-    file = current_setting_file_name(name)
-    if os.path.exists(file) and os.path.isfile(file):
-        with open(file, 'r') as f:
-            value = f.read().strip()
-            return value
-    else:
-        return None
+    return read_state().get(name)
+
+def set_currents(updates):
+    r"""
+    set current settings in a batch
+    all values are written at once, under a lock of other writers
+    """
+    os.makedirs(os.path.dirname(STATE), exist_ok=True)
+    # a lock file aside, the state file itself is replaced on write
+    with open(f'{STATE}.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _state_cache['values'] = None # re-read latest
+        values = dict(read_state())
+        values.update({name: str(value) for name, value in updates.items()})
+        state = {'version': STATE_VERSION, 'current': values}
+        write_atomic(STATE, json.dumps(state, ensure_ascii=False, indent=2) + '\n')
+        _state_cache['mtime'] = os.stat(STATE).st_mtime_ns
+        _state_cache['values'] = values
 
 def set_current(name, value):
     r"""
     set current settings
     """
-    file = current_setting_file_name(name)
-    with open(file, 'w') as f:
-        f.write(value)
+    set_currents({name: value})
 
 def a():
     r"""
@@ -114,20 +199,42 @@ def zenn_name():
     get current name for zenn article
     """
     key = get_current('key')
-    found = list(Path(Z_DOC).glob(f'{key}-*.md'))
+    index = slug_index()
+    found = index.slugs(key)
     match len(found):
-        case 0: # generate new one
-            digit = str(random.randint(10000, 99999))
-            name = f'{key}-{digit}'
-            print(f'new zenn article name generated: {name}')
+        case 0: # use reserved one, or generate new one
+            name = index.reserved(key)
+            if name is None:
+                digit = str(random.randint(10000, 99999))
+                name = f'{key}-{digit}'
+                index.reserve(key, name)
+                print(f'new zenn article name generated: {name}')
         case 1: # use existing one
-            name = found[0].stem.split('.')[0]
+            name = found[0]
         case _: # not expected
             print(f'Warning: multiple files found for {key}.')
-            print([f.stem for f in found])
+            print(found)
             raise ValueError(f'Multiple files found for {key}. Please resolve the conflict.')
     return name
 
+def slug_index():
+    r"""
+    get map of zenn article slugs
+    """
+    global _slug_index
+    if _slug_index is None:
+        _slug_index = conf_index.SlugIndex(SLUG_INDEX, Z_DOC)
+    return _slug_index
+
+def manifest():
+    r"""
+    get manifest of article updates
+    """
+    global _manifest
+    if _manifest is None:
+        _manifest = conf_index.UpdateManifest(MANIFEST)
+    return _manifest
+
 def qiita_path():
     r"""
     get current `qiita article md` path
@@ -208,28 +315,32 @@ def used_tags(top=0):
     with positive top: sorted by occurrence descending
     otherwise: all tags sorted by alphabet
     """
-    all_tags_nested = with_all_meta_yaml(read_yaml_tags)
-    all_tags = [tag for tags in all_tags_nested for tag in tags] # flatten
-    uniq_tags = sorted(set(all_tags))
-
     if top > 0:
-        add_count = {}
-        for tag in uniq_tags:
-            add_count[tag] = all_tags.count(tag)
-        #add_count['Ubuntu'] += 1
-        #add_count['Android'] += 2
-        sorted_tags = sorted(add_count.items(), key=lambda x: x[1], reverse=True)
-        top_tags = [tag for tag, count in sorted_tags][:top]
-        return top_tags
+        return tag_stats().top(top)
     else:
-        return uniq_tags
+        return tag_stats().tags()
+
+def tag_stats():
+    r"""
+    get tag statistics on refreshed meta index
+    """
+    return conf_tags.TagStats(meta_index())
+
+def meta_index():
+    r"""
+    get index of all meta yaml, refreshed
+    """
+    global _meta_index
+    if _meta_index is None:
+        _meta_index = conf_index.MetaIndex(META_INDEX, DOC, read_yaml, conf_meta.read_meta_many)
+    _meta_index.refresh()
+    return _meta_index
 
 def with_all_meta_yaml(func):
     r"""
-    scan for all meta yaml
+    apply func to all meta yaml
     """
-    yamls = list(Path(DOC).glob('met*/*.yaml'))
-    return [func(yaml) for yaml in yamls if yaml.is_file()]
+    return [func(Path(yaml)) for yaml in meta_index().paths()]
 
 def find_a_random_meta_yaml():
     r"""
@@ -238,7 +349,7 @@ def find_a_random_meta_yaml():
     """
     import random
 
-    yamls = list(Path(DOC).glob('met*/*.yaml'))
+    yamls = meta_index().paths()
     if len(yamls) > 0:
         return yamls[random.randrange(len(yamls))]
     else:
@@ -248,20 +359,7 @@ def read_yaml(yaml):
     r"""
     read yaml file
     """
-    result = {}
-    if os.path.exists(yaml) and os.path.isfile(yaml):
-        with open(yaml, 'r') as f:
-            lines = f.readlines()
-        for line in lines:
-            if re.search(r'.:', line):
-                key, value = line.split(':', 1)
-                clean_value = value.strip()
-                if key == 'tags':
-                    tags = clean_value.split()
-                    result[key] = tags
-                else:
-                    result[key] = clean_value
-    return result
+    return conf_meta.read_meta(yaml)
 
 def read_yaml_tags(yaml):
     r"""
@@ -277,8 +375,11 @@ def test():
     print('BASE:', BASE)
     print('DOC:', DOC)
     print('current_setting_file_name:', current_setting_file_name('test'))
+    print('read_legacy_state:', read_legacy_state())
+    print('read_state:', read_state())
     print('get:', get_current('test'))
     #print('set:', set_current('test', 'test_value'))
+    #print('set:', set_currents({'test': 'test_value', 'test2': 'test_value2'}))
     #print('get:', get_current('test'))
     #print('set:', set_current('test', 'test_value2'))
     #print('get:', get_current('test'))
@@ -293,6 +394,7 @@ def test():
     print('zenn_name:', zenn_name())
     print('qiita_path:', qiita_path())
     print('zenn_path:', zenn_path())
+    print('manifest:', manifest())
     print('date_format_reiwa:', date_format_reiwa(datetime.datetime.now()))
     print('date_parse_reiwa:', date_parse_reiwa('60229'))
     print('date_parse_reiwa:', date_parse_reiwa('320420'))
@@ -310,6 +412,8 @@ def test():
     print('used_tags:', used_tags(3))
     print('used_tags:', used_tags(30))
     print('used_tags:', used_tags(0))
+    print('meta_index:', meta_index())
+    print('tag_stats:', tag_stats().counts(5))
     print('with_all_meta_yaml:', with_all_meta_yaml(read_yaml_tags))
     print('read_yaml:', read_yaml(find_a_random_meta_yaml()))
     print('read_yaml:', read_yaml('test.yaml'))
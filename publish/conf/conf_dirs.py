@@ -7,9 +7,10 @@ local directories
 copyright 2025, hanagai
 
 conf/conf_dirs.py
-version: May 22, 2025
+version: October 18, 2026
 """
 
+import os
 import os.path
 
 HOME = os.path.expanduser('~')
@@ -20,6 +21,10 @@ HOME = os.path.expanduser('~')
 #DOC_HOME = os.path.abspath('../..')
 # relative to this file
 DOC_HOME = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+# environment overrides, such as a synthetic corpus for benchmark
+DOC_HOME_ENV = 'ARTICLE_DOC_HOME'
+if os.environ.get(DOC_HOME_ENV):
+  DOC_HOME = os.path.abspath(os.environ[DOC_HOME_ENV])
 
 BASE = os.path.join(DOC_HOME, 'article-base-doc')
 QIITA = os.path.join(DOC_HOME, 'article-qiita-doc')
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+module conf:
+persistent index of article meta yaml
+copyright 2026, hanagai
+
+conf/conf_index.py
+version: October 18, 2026
+"""
+
+import os
+import os.path
+import sqlite3
+import threading
+
+class MetaIndex:
+    r"""
+    persistent index of meta yaml files, docs/met*/*.yaml
+    refreshed incrementally by directory and file mtime
+    tags and their statistics are kept in the same transaction
+    """
+
+    SCHEMA_VERSION = 2
+    COLUMNS = ('path', 'key', 'series', 'title', 'tags', 'type', 'emoji', 'now', 'mtime')
+
+    def __init__(self, db_path, doc, reader, batch_reader=None):
+        # db_path: sqlite file to store the index
+        # doc: docs directory of base
+        # reader: function to read a meta yaml into dict
+        # batch_reader: function to read list of meta yaml (optional)
+        self.db_path = db_path
+        self.doc = doc
+        self.reader = reader
+        self.batch_reader = batch_reader
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.db_path},'
+            f'{self.doc},'
+            f')'
+        )
+
+    def connection(self):
+        r"""
+        open the index database, create tables if required
+        """
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self.create_tables()
+            return self._conn
+
+    def create_tables(self):
+        r"""
+        create tables, drop old ones on schema or docs change
+        """
+        conn = self._conn
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        with conn:
+            if version != self.SCHEMA_VERSION:
+                self.drop_tables()
+            conn.execute('CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT)')
+            conn.execute('CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime INTEGER)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS meta ('
+                'path TEXT PRIMARY KEY, key TEXT, series TEXT, title TEXT,'
+                ' tags TEXT, type TEXT, emoji TEXT, now INTEGER, mtime INTEGER)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS meta_key ON meta (key)')
+            conn.execute('CREATE TABLE IF NOT EXISTS tags (path TEXT, tag TEXT, now INTEGER)')
+            conn.execute('CREATE INDEX IF NOT EXISTS tags_path ON tags (path)')
+            conn.execute('CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag, path)')
+            conn.execute('CREATE TABLE IF NOT EXISTS tag_stats (tag TEXT PRIMARY KEY, count INTEGER, last_now INTEGER)')
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            row = conn.execute("SELECT value FROM info WHERE name = 'doc'").fetchone()
+            if row is None or row[0] != self.doc:
+                # indexed for another docs directory
+                for table in ['dirs', 'meta', 'tags', 'tag_stats']:
+                    conn.execute(f'DELETE FROM {table}')
+                conn.execute("INSERT OR REPLACE INTO info VALUES ('doc', ?)", (self.doc,))
+
+    def drop_tables(self):
+        r"""
+        drop all tables of the index
+        """
+        for table in ['info', 'dirs', 'meta', 'tags', 'tag_stats']:
+            self._conn.execute(f'DROP TABLE IF EXISTS {table}')
+
+    @staticmethod
+    def mtime(path):
+        r"""
+        return mtime in ns, or None if not exists
+        """
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def scan_meta_dirs(self):
+        r"""
+        list docs/met* directories
+        """
+        return [entry.path for entry in os.scandir(self.doc) if entry.name.startswith('met') and entry.is_dir()]
+
+    @staticmethod
+    def scan_yaml_files(meta_dir):
+        r"""
+        list *.yaml files in a meta directory
+        """
+        return [entry.path for entry in os.scandir(meta_dir) if entry.name.endswith('.yaml') and entry.is_file()]
+
+    @staticmethod
+    def reiwa_number(key):
+        r"""
+        return Reiwa date prefix of key as int, YMMDD_name
+        None if the key has no date prefix
+        """
+        now = key.split('_', 1)[0]
+        return int(now) if now.isdigit() else None
+
+    def read_all(self, paths):
+        r"""
+        read meta yaml files, by batch_reader if available
+        """
+        if self.batch_reader is not None and len(paths) > 1:
+            return self.batch_reader(paths)
+        return [self.reader(path) for path in paths]
+
+    def record(self, path, yaml, mtime):
+        r"""
+        make a row of the index from a meta yaml
+        """
+        key = os.path.basename(path)[:-len('.yaml')]
+        series = os.path.basename(os.path.dirname(path))[len('met'):]
+        tags = yaml.get('tags', [])
+        now = self.reiwa_number(key)
+        return (path, key, series, yaml.get('title'), ' '.join(tags), yaml.get('type'), yaml.get('emoji'), now, mtime)
+
+    def update_tags(self, updates, removes):
+        r"""
+        replace tags of changed files and recount affected tags only
+        called in the transaction of refresh
+        """
+        conn = self._conn
+        changed = removes + [(row[0],) for row in updates]
+        affected = set()
+        for (path,) in changed:
+            affected.update(tag for (tag,) in conn.execute('SELECT tag FROM tags WHERE path = ?', (path,)))
+        conn.executemany('DELETE FROM tags WHERE path = ?', changed)
+
+        rows = []
+        for row in updates:
+            path, tags, now = row[0], row[4].split(), row[7]
+            rows.extend((path, tag, now) for tag in dict.fromkeys(tags))
+            affected.update(tags)
+        conn.executemany('INSERT INTO tags VALUES (?, ?, ?)', rows)
+
+        for tag in affected:
+            count, last_now = conn.execute('SELECT COUNT(*), MAX(now) FROM tags WHERE tag = ?', (tag,)).fetchone()
+            if count == 0:
+                conn.execute('DELETE FROM tag_stats WHERE tag = ?', (tag,))
+            else:
+                conn.execute('INSERT OR REPLACE INTO tag_stats VALUES (?, ?, ?)', (tag, count, last_now))
+
+    def refresh(self):
+        r"""
+        bring the index up to date
+        directories are listed only when their mtime changed,
+        files are parsed only when their mtime changed.
+        """
+        with self._lock:
+            return self.refresh_locked()
+
+    def refresh_locked(self):
+        r"""
+        refresh, called with lock
+        """
+        conn = self.connection()
+        known_dirs = dict(conn.execute('SELECT path, mtime FROM dirs'))
+        known_files = dict(conn.execute('SELECT path, mtime FROM meta'))
+        known_by_dir = {}
+        for path in known_files:
+            known_by_dir.setdefault(os.path.dirname(path), []).append(path)
+
+        doc_mtime = self.mtime(self.doc)
+        if doc_mtime is None:
+            meta_dirs = []
+        elif known_dirs.get(self.doc) == doc_mtime:
+            meta_dirs = [path for path in known_dirs if path != self.doc]
+        else:
+            meta_dirs = self.scan_meta_dirs()
+
+        dir_mtimes = {self.doc: doc_mtime} if doc_mtime is not None else {}
+        files = []
+        for meta_dir in meta_dirs:
+            dir_mtime = self.mtime(meta_dir)
+            if dir_mtime is None:
+                continue
+            dir_mtimes[meta_dir] = dir_mtime
+            if known_dirs.get(meta_dir) == dir_mtime:
+                files.extend(known_by_dir.get(meta_dir, []))
+            else:
+                files.extend(self.scan_yaml_files(meta_dir))
+
+        changed = {}
+        for path in files:
+            file_mtime = self.mtime(path)
+            if file_mtime is not None and known_files.get(path) != file_mtime:
+                changed[path] = file_mtime
+        yamls = self.read_all(list(changed))
+        updates = [self.record(path, yaml, mtime) for (path, mtime), yaml in zip(changed.items(), yamls)]
+        removes = [(path,) for path in known_files.keys() - set(files)]
+
+        if updates or removes or dir_mtimes != known_dirs:
+            with conn:
+                conn.executemany('DELETE FROM meta WHERE path = ?', removes)
+                conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', updates)
+                self.update_tags(updates, removes)
+                conn.execute('DELETE FROM dirs')
+                conn.executemany('INSERT INTO dirs VALUES (?, ?)', dir_mtimes.items())
+        return len(updates), len(removes)
+
+    def query(self, sql, parameters=()):
+        r"""
+        run a query and return all rows, not in the middle of refresh
+        """
+        with self._lock:
+            return self.connection().execute(sql, parameters).fetchall()
+
+    def entries(self):
+        r"""
+        return all articles as list of dict
+        """
+        rows = self.query(f'SELECT {", ".join(self.COLUMNS)} FROM meta ORDER BY path')
+        return [self.as_dict(row) for row in rows]
+
+    def find(self, key):
+        r"""
+        return articles of the key as list of dict
+        """
+        rows = self.query(f'SELECT {", ".join(self.COLUMNS)} FROM meta WHERE key = ? ORDER BY path', (key,))
+        return [self.as_dict(row) for row in rows]
+
+    def series_of(self, key):
+        r"""
+        return list of series having the key
+        """
+        return [entry['series'] for entry in self.find(key)]
+
+    def paths(self):
+        r"""
+        return all meta yaml paths
+        """
+        return [row[0] for row in self.query('SELECT path FROM meta ORDER BY path')]
+
+    def all_tags(self):
+        r"""
+        return tags of all articles as nested list
+        """
+        return [tags.split() for (tags,) in self.query('SELECT tags FROM meta ORDER BY path')]
+
+    def as_dict(self, row):
+        r"""
+        convert a row to dict, tags as list
+        """
+        entry = dict(zip(self.COLUMNS, row))
+        entry['tags'] = entry['tags'].split()
+        return entry
+
+class SlugIndex:
+    r"""
+    persistent map of zenn article slugs, key -> {key}-{digit}
+    refreshed when the articles directory mtime changed
+    new slugs are reserved until the article file is created
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, z_doc):
+        # db_path: sqlite file to store the map
+        # z_doc: articles directory of zenn
+        self.db_path = db_path
+        self.z_doc = z_doc
+        self._conn = None
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._slugs = {}
+        self._reserved = {}
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.db_path},'
+            f'{self.z_doc},'
+            f')'
+        )
+
+    def connection(self):
+        r"""
+        open the map database, create tables if required
+        """
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self.create_tables()
+            return self._conn
+
+    def create_tables(self):
+        r"""
+        create tables, drop old ones on schema or directory change
+        """
+        conn = self._conn
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        with conn:
+            if version != self.SCHEMA_VERSION:
+                for table in ['info', 'slugs', 'reserved']:
+                    conn.execute(f'DROP TABLE IF EXISTS {table}')
+            conn.execute('CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT)')
+            conn.execute('CREATE TABLE IF NOT EXISTS slugs (slug TEXT PRIMARY KEY, key TEXT)')
+            conn.execute('CREATE TABLE IF NOT EXISTS reserved (key TEXT PRIMARY KEY, slug TEXT)')
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+            row = conn.execute("SELECT value FROM info WHERE name = 'dir'").fetchone()
+            if row is None or row[0] != self.z_doc:
+                for table in ['info', 'slugs', 'reserved']:
+                    conn.execute(f'DELETE FROM {table}')
+                conn.execute("INSERT INTO info VALUES ('dir', ?)", (self.z_doc,))
+
+    @staticmethod
+    def key_of(slug):
+        r"""
+        return key of a slug, {key}-{digit}
+        None if not a slug made by this tool
+        """
+        key, sep, digit = slug.rpartition('-')
+        return key if sep else None
+
+    def scan(self):
+        r"""
+        list slugs of *.md in the articles directory
+        """
+        return [entry.name.split('.')[0] for entry in os.scandir(self.z_doc) if entry.name.endswith('.md') and entry.is_file()]
+
+    def refresh(self):
+        r"""
+        rescan the articles directory only when its mtime changed
+        """
+        with self._lock:
+            self.refresh_locked()
+
+    def refresh_locked(self):
+        r"""
+        refresh, called with lock
+        """
+        mtime = MetaIndex.mtime(self.z_doc)
+        if self._mtime is not None and self._mtime == mtime:
+            return
+        conn = self.connection()
+        row = conn.execute("SELECT value FROM info WHERE name = 'mtime'").fetchone()
+        if mtime is not None and row is not None and row[0] == str(mtime):
+            rows = conn.execute('SELECT slug, key FROM slugs')
+        else:
+            rows = [(slug, self.key_of(slug)) for slug in self.scan()] if mtime is not None else []
+            rows = [(slug, key) for slug, key in rows if key is not None]
+            with conn:
+                conn.execute('DELETE FROM slugs')
+                conn.executemany('INSERT INTO slugs VALUES (?, ?)', rows)
+                # reservation is done when the file is created
+                conn.executemany('DELETE FROM reserved WHERE key = ?', [(key,) for slug, key in rows])
+                conn.execute("INSERT OR REPLACE INTO info VALUES ('mtime', ?)", (str(mtime),))
+        self._slugs = {}
+        for slug, key in rows:
+            self._slugs.setdefault(key, []).append(slug)
+        self._reserved = dict(conn.execute('SELECT key, slug FROM reserved'))
+        self._mtime = mtime
+        for key, slugs in self._slugs.items():
+            if len(slugs) > 1:
+                print(f'Warning: multiple files found for {key}. {sorted(slugs)}')
+
+    def slugs(self, key):
+        r"""
+        return list of slugs of existing files for the key
+        """
+        self.refresh()
+        return sorted(self._slugs.get(key, []))
+
+    def reserved(self, key):
+        r"""
+        return slug reserved for the key, None if not reserved
+        """
+        self.refresh()
+        return self._reserved.get(key)
+
+    def reserve(self, key, slug):
+        r"""
+        reserve a new slug for the key
+        """
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO reserved VALUES (?, ?)', (key, slug))
+            self._reserved[key] = slug
+
+
+class UpdateManifest:
+    r"""
+    persistent map of (key, target) -> hashes of inputs and output of the last update
+    an update is skipped while both are the same
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path):
+        # db_path: sqlite file to store the map, shared by processes
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.db_path},'
+            f')'
+        )
+
+    def connection(self):
+        r"""
+        open the map database, create tables if required
+        """
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+                # batch runs update many keys at once
+                self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+                self.create_tables()
+            return self._conn
+
+    def create_tables(self):
+        r"""
+        create tables, drop old ones on schema change
+        """
+        conn = self._conn
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        with conn:
+            if version != self.SCHEMA_VERSION:
+                conn.execute('DROP TABLE IF EXISTS manifest')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS manifest ('
+                'key TEXT, target TEXT, inputs TEXT, output TEXT, PRIMARY KEY (key, target))'
+            )
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def get(self, key, target):
+        r"""
+        return (inputs, output) hashes, None if not recorded
+        """
+        with self._lock:
+            row = self.connection().execute(
+                'SELECT inputs, output FROM manifest WHERE key = ? AND target = ?', (key, target)
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def put(self, key, target, inputs, output):
+        r"""
+        record hashes of an update
+        """
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?)', (key, target, inputs, output))
+
+    def forget(self, key, target):
+        r"""
+        remove record, the next update runs for sure
+        """
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                conn.execute('DELETE FROM manifest WHERE key = ? AND target = ?', (key, target))
+
+
+def test():
+    import conf_dirs
+    print('test launched manually.')
+    def reader(path):
+        with open(path, 'r') as f:
+            pairs = [line.split(':', 1) for line in f if ':' in line]
+        yaml = {key: value.strip() for key, value in pairs}
+        yaml['tags'] = yaml.get('tags', '').split()
+        return yaml
+    a = MetaIndex(os.path.join(conf_dirs.TMP, 'test_index.sqlite3'), os.path.join(conf_dirs.BASE, 'docs'), reader)
+    print(a)
+    print('refresh:', a.refresh())
+    print('refresh:', a.refresh())
+    print('paths:', a.paths()[:5])
+    print('entries:', a.entries()[:3])
+    print('series_of:', a.series_of('70525_publish_zenn_qiita'))
+    print('all_tags:', a.all_tags()[:5])
+    b = SlugIndex(os.path.join(conf_dirs.TMP, 'test_slugs.sqlite3'), os.path.join(conf_dirs.ZENN, 'articles'))
+    print(b)
+    print('slugs:', b.slugs('70525_publish_zenn_qiita'))
+    print('reserved:', b.reserved('not_exist'))
+    c = UpdateManifest(os.path.join(conf_dirs.TMP, 'test_manifest.sqlite3'))
+    print(c)
+    c.put('not_exist', 'zenn', 'inputs', 'output')
+    print('get:', c.get('not_exist', 'zenn'))
+    c.forget('not_exist', 'zenn')
+    print('get:', c.get('not_exist', 'zenn'))
+
+if __name__ == '__main__':
+    test()
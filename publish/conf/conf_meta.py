@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+module conf:
+parse meta yaml and front matter
+copyright 2026, hanagai
+
+conf/conf_meta.py
+version: October 18, 2026
+"""
+
+import os
+import os.path
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# line kinds, in order of classification
+SEPARATOR = 'separator'
+H1 = 'h1'
+BLANK = 'blank'
+YAML_ARRAY = 'yaml_array'
+YAML_KEY = 'yaml_key'
+TEXT = 'text'
+
+# one pattern for all line kinds, the first matched group wins
+LINE_PATTERN = re.compile(
+    r'(?P<separator>---\s*\Z)'
+    r'|(?P<h1>\s*#\s)'
+    r'|(?P<blank>\s*$)'
+    r'|(?P<yaml_array>\s+-\s)'
+    r'|(?P<yaml_key>(?P<key>[^:\n]+):)'
+)
+META_PATTERN = re.compile(r'^(?P<key>[^\n]+?):(?P<value>.*)$', re.MULTILINE)
+INLINE_ARRAY_PATTERN = re.compile(r'^\[(.*)\]$')
+QUOTED_PATTERN = re.compile(r'''^(["'])(.*)\1$''')
+
+# more files than this are parsed by a process pool
+BATCH_THRESHOLD = 256
+
+def classify(line):
+    r"""
+    return (kind, yaml key) of a line
+    kind: separator, h1, blank, yaml_array, yaml_key or text
+    yaml key: key name for yaml_key, otherwise None
+    """
+    matched = LINE_PATTERN.match(line)
+    if matched is None:
+        return TEXT, None
+    kind = matched.lastgroup
+    if kind == YAML_KEY:
+        return kind, matched.group('key')
+    return kind, None
+
+def is_yaml_key(line, keys):
+    r"""
+    return True if line has any of keys as yaml key
+    """
+    kind, key = classify(line)
+    return kind == YAML_KEY and key in keys
+
+def parse_meta(text):
+    r"""
+    parse base meta yaml, `key: value` on each line
+    tags is split into list, unknown keys are kept as string
+    """
+    result = {}
+    for matched in META_PATTERN.finditer(text):
+        key = matched.group('key')
+        value = matched.group('value').strip()
+        result[key] = value.split() if key == 'tags' else value
+    return result
+
+def read_meta(path):
+    r"""
+    read base meta yaml file
+    empty dict if not exists
+    """
+    if os.path.exists(path) and os.path.isfile(path):
+        with open(path, 'r') as f:
+            return parse_meta(f.read())
+    return {}
+
+def read_meta_many(paths, workers=None):
+    r"""
+    read many base meta yaml files
+    a process pool is used for a large batch
+    """
+    paths = [str(path) for path in paths]
+    if len(paths) < BATCH_THRESHOLD:
+        return [read_meta(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(read_meta, paths, chunksize=chunk))
+
+def unquote(value):
+    r"""
+    remove quotes around a scalar value
+    """
+    matched = QUOTED_PATTERN.match(value)
+    return matched.group(2) if matched else value
+
+def parse_value(value, items):
+    r"""
+    parse a front matter value
+    inline array `["a", "b"]`, block array `  - a` items or scalar
+    """
+    if items:
+        return [unquote(item.strip()) for item in items]
+    matched = INLINE_ARRAY_PATTERN.match(value)
+    if matched:
+        inner = matched.group(1).strip()
+        return [unquote(item.strip()) for item in inner.split(',')] if inner else []
+    return unquote(value)
+
+class FrontMatter:
+    r"""
+    front matter of zenn and qiita article, between 2 `---` lines
+    lines are kept as is for round trip, only keys set are rewritten
+    """
+
+    def __init__(self, fields, body):
+        # fields: list of [key, lines], key is None for other lines
+        self.fields = fields
+        self.body = body
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.keys()},'
+            f')'
+        )
+
+    def keys(self):
+        return [key for key, lines in self.fields if key is not None]
+
+    def raw(self, key):
+        r"""
+        return lines of the key, None if not found
+        """
+        for field_key, lines in self.fields:
+            if field_key == key:
+                return lines
+        return None
+
+    def get(self, key, default=None):
+        r"""
+        return parsed value of the key
+        """
+        lines = self.raw(key)
+        if lines is None:
+            return default
+        value = lines[0].split(':', 1)[1].strip()
+        items = [re.sub(r'^\s+-\s', '', line.rstrip('\n')) for line in lines[1:] if classify(line)[0] == YAML_ARRAY]
+        return parse_value(value, items)
+
+    def values(self):
+        r"""
+        return all parsed values as dict
+        """
+        return {key: self.get(key) for key in self.keys()}
+
+    def set_lines(self, key, lines):
+        r"""
+        replace lines of the key, append if not found
+        """
+        for field in self.fields:
+            if field[0] == key:
+                field[1] = lines
+                return
+        self.fields.append([key, lines])
+
+    def remove(self, key):
+        r"""
+        remove the key
+        """
+        self.fields = [field for field in self.fields if field[0] != key]
+
+    def dump(self):
+        r"""
+        return front matter text including separators, without body
+        """
+        lines = [line for key, field_lines in self.fields for line in field_lines]
+        return ''.join(['---\n', *lines, '---\n'])
+
+def parse_front_matter(text):
+    r"""
+    split front matter and body in a single pass
+    None if text does not start with a separator
+    """
+    lines = text.splitlines(keepends=True)
+    if len(lines) == 0 or classify(lines[0])[0] != SEPARATOR:
+        return None
+    fields = []
+    for number, line in enumerate(lines[1:], start=1):
+        kind, key = classify(line)
+        if kind == SEPARATOR:
+            return FrontMatter(fields, ''.join(lines[number + 1:]))
+        if kind == YAML_KEY:
+            fields.append([key, [line]])
+        elif kind == YAML_ARRAY and fields and fields[-1][0] is not None:
+            fields[-1][1].append(line)
+        else:
+            fields.append([None, [line]])
+    return None # no 2nd separator
+
+def read_front_matter(path):
+    r"""
+    read front matter of zenn or qiita article file
+    """
+    with open(path, 'r') as f:
+        return parse_front_matter(f.read())
+
+
+def test():
+    print('test launched manually.')
+    for line in ['---\n', '--- ', '----', '# any', ' # any', '#any', '', '  \n', '  - any', '- any', 'title: any', ' title: any', 'text']:
+        print(repr(line), classify(line))
+    print(is_yaml_key('title: any', ['title', 'tags']))
+    print(is_yaml_key('name: any', ['title', 'tags']))
+    print(parse_meta('title: a: b\ntags: Android  Ubuntu\ntype: tech\nemoji: 🐚\nextra: kept\n'))
+    zenn = '---\ntitle: "Zenn"\ntopics: ["a", "b"]\ntype: "tech"\nemoji: "🐚"\npublished: true\n---\n# body\n'
+    qiita = "---\ntitle: 'Qiita'\ntags:\n  - Android\n  - Ubuntu\nprivate: false\nid: null\n---\n# body\n"
+    for text in [zenn, qiita]:
+        front = parse_front_matter(text)
+        print(front, front.values())
+        print(front.dump() + front.body == text)
+    print(parse_front_matter('# no front matter\n'))
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+module conf:
+tag statistics on the meta index
+copyright 2026, hanagai
+
+conf/conf_tags.py
+version: October 18, 2026
+"""
+
+class TagStats:
+    r"""
+    tag statistics on the meta index
+    counts, last used date and co-occurrence
+    """
+
+    def __init__(self, index):
+        # index: conf_index.MetaIndex, refreshed by caller
+        self.index = index
+
+    def __str__(self):
+        return (
+            f'{self.__class__.__name__}('
+            f'{self.index},'
+            f')'
+        )
+
+    def query(self, sql, parameters=()):
+        r"""
+        run a query on the index
+        """
+        return self.index.query(sql, parameters)
+
+    def counts(self, top=0):
+        r"""
+        return list of (tag, count, last_now) sorted by count descending
+        with positive top: only top of them
+        last_now is the Reiwa date of the latest article as int, YMMDD
+        """
+        limit = top if top > 0 else -1
+        return self.query('SELECT tag, count, last_now FROM tag_stats ORDER BY count DESC, tag LIMIT ?', (limit,))
+
+    def top(self, top):
+        r"""
+        return top tags sorted by count descending
+        """
+        return [tag for tag, count, last_now in self.counts(top)]
+
+    def tags(self):
+        r"""
+        return all tags sorted by alphabet
+        """
+        return [tag for (tag,) in self.query('SELECT tag FROM tag_stats ORDER BY tag')]
+
+    def count(self, tag):
+        r"""
+        return number of articles having the tag
+        """
+        found = self.query('SELECT count FROM tag_stats WHERE tag = ?', (tag,))
+        return found[0][0] if found else 0
+
+    def last_used(self, tag):
+        r"""
+        return Reiwa date string of the latest article having the tag
+        None if unknown
+        """
+        found = self.query('SELECT last_now FROM tag_stats WHERE tag = ?', (tag,))
+        return str(found[0][0]) if found and found[0][0] is not None else None
+
+    def co_occurrence(self, tags, top=0):
+        r"""
+        return list of (tag, count) appearing together with any of tags
+        sorted by count together, then by count in total
+        """
+        if len(tags) == 0:
+            return []
+        marks = ', '.join('?' * len(tags))
+        limit = top if top > 0 else -1
+        return self.query(
+            'SELECT b.tag, COUNT(DISTINCT b.path) AS together FROM tags a'
+            ' JOIN tags b ON b.path = a.path'
+            ' JOIN tag_stats s ON s.tag = b.tag'
+            f' WHERE a.tag IN ({marks}) AND b.tag NOT IN ({marks})'
+            ' GROUP BY b.tag ORDER BY together DESC, s.count DESC, b.tag LIMIT ?',
+            (*tags, *tags, limit))
+
+    def suggest(self, tags, top=10):
+        r"""
+        return tags to suggest for an article having tags
+        the most used tags if no tags are given
+        """
+        if len(tags) == 0:
+            return self.top(top)
+        return [tag for tag, together in self.co_occurrence(tags, top)]
+
+
+def test():
+    import os.path
+    import conf_dirs
+    import conf_index
+    print('test launched manually.')
+    index = conf_index.MetaIndex(os.path.join(conf_dirs.TMP, 'test_index.sqlite3'), os.path.join(conf_dirs.BASE, 'docs'), lambda path: {})
+    a = TagStats(index)
+    print(a)
+    print('counts:', a.counts(5))
+    print('top:', a.top(3))
+    print('tags:', a.tags())
+    print('count:', a.count('Ubuntu'))
+    print('last_used:', a.last_used('Ubuntu'))
+    print('co_occurrence:', a.co_occurrence(['Ubuntu'], 5))
+    print('suggest:', a.suggest(['Android']))
+    print('suggest:', a.suggest([]))
+
+if __name__ == '__main__':
+    test()
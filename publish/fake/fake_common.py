@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+shared parts of offline stand-ins for gh and npx.
+copyright 2026, hanagai
+
+fake/fake_common.py
+version: October 18, 2026
+
+put this directory first in PATH to use them:
+  PATH=/path/to/publish/fake:$PATH ./all_publish.py
+
+environment:
+  ARTICLE_FAKE_STATE    state file of pull requests and calls,
+                        default: $TMPDIR/article_fake_state.json
+  ARTICLE_FAKE_LATENCY  seconds to sleep on each call, `0.5`,
+                        or per command prefix, `gh pr create=1.5,gh=0.3,npx=2`
+  ARTICLE_FAKE_BANNER   `1` to print the npm update banner before npx output
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import os.path
+import subprocess
+import sys
+import tempfile
+import time
+
+STATE_ENV = 'ARTICLE_FAKE_STATE'
+LATENCY_ENV = 'ARTICLE_FAKE_LATENCY'
+BANNER_ENV = 'ARTICLE_FAKE_BANNER'
+STATE_VERSION = 1
+
+def state_path():
+  return os.environ.get(STATE_ENV) or os.path.join(tempfile.gettempdir(), 'article_fake_state.json')
+
+def parse_latency(spec):
+  r"""
+  return {command prefix: seconds}, '' for the default
+  """
+  latency = {}
+  for item in spec.split(','):
+    item = item.strip()
+    if item == '':
+      continue
+    prefix, sep, seconds = item.rpartition('=')
+    latency[prefix.strip() if sep else ''] = float(seconds)
+  return latency
+
+def latency_of(command, spec):
+  r"""
+  seconds for the longest matching prefix of command
+  """
+  line = ' '.join(command)
+  latency = parse_latency(spec)
+  matched = [prefix for prefix in latency if line == prefix or line.startswith(f'{prefix} ') or prefix == '']
+  if len(matched) == 0:
+    return 0.0
+  return latency[max(matched, key=len)]
+
+def inject_latency(command):
+  seconds = latency_of(command, os.environ.get(LATENCY_ENV, ''))
+  if seconds > 0:
+    time.sleep(seconds)
+
+@contextlib.contextmanager
+def locked_state():
+  r"""
+  yield state dict under a file lock, saved on exit
+  """
+  path = state_path()
+  os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+  with open(f'{path}.lock', 'w') as lock:
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    try:
+      with open(path, 'r') as f:
+        state = json.load(f)
+    except FileNotFoundError:
+      state = {'version': STATE_VERSION, 'pulls': {}, 'calls': []}
+    yield state
+    temp = f'{path}.{os.getpid()}'
+    with open(temp, 'w') as f:
+      json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(temp, path)
+
+def record_call(command):
+  r"""
+  record a call for tests counting invocations
+  """
+  with locked_state() as state:
+    state['calls'].append({'argv': command, 'cwd': os.getcwd(), 'time': time.time()})
+
+def repo_of(cwd):
+  r"""
+  (account, repo) of a local repository, same as CommonGit
+  """
+  path = os.path.abspath(cwd)
+  return os.path.basename(os.path.dirname(path)), os.path.basename(path)
+
+def repo_url(account, repo):
+  return f'https://{account}@github.com/{account}/{repo}.git'
+
+def git(*args, check=True):
+  r"""
+  run git in cwd, return stdout
+  """
+  result = subprocess.run(['git', *args], capture_output=True, text=True)
+  if check and result.returncode != 0:
+    fail(f'git {" ".join(args)}: {result.stderr.strip()}')
+  return result.stdout.strip()
+
+def fail(message, code=1):
+  print(message, file=sys.stderr)
+  sys.exit(code)
+
+def begin(name):
+  r"""
+  common start of a fake command, return command line
+  """
+  command = [name, *sys.argv[1:]]
+  inject_latency(command)
+  record_call(command)
+  return command
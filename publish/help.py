@@ -6,7 +6,7 @@ help
 copyright 2025, hanagai
 
 help.py
-version: June 8, 2025
+version: October 18, 2026
 """
 
 def help_usage():
@@ -33,9 +33,11 @@ def help_usage():
 ./zenn_init.py    create a new article file at zenn-doc.
   -d --dry              disable file writing and git
   -n --nogit            disable git
+  --npx                 create the file by npx, rather than natively
 ./qiita_init.py   create a new article file at qiita-doc.
   -d --dry              disable file writing and git
   -n --nogit            disable git
+  --npx                 create the file by npx, rather than natively
 
 ./zenn_update.py  update current new article file at zenn-doc.
   -d --dry              disable file writing and git
@@ -48,17 +50,35 @@ def help_usage():
 
 ./zenn_previwe.sh   preview zenn article
 ./qiita_preview.sh  preview qiita article
+./preview_watch.py  keep preview servers alive, re-render articles on base edits without git
+  -t --targets          zenn and/or qiita, default: both
+  --noserver            only re-render, preview servers are run elsewhere
+  --debounce            seconds without change before re-rendering, default: 0.15
+  --polling             poll files rather than inotify
+  -v --verbose          show output of re-rendering
 
 ./all_publish.py    base_publish, zenn_publish and qiita_publish
   -d --dry              disable git writing
   -n --nomerge          create pull request, but not merge it
   -i --ignore           ignore uncommitted changes
+  -p --parallel         publish base, zenn and qiita at once
 
 ./nolook_publish.py zenn_init/update, qiita init/update and all_publish
   --publish             required to confirm
   -d --dry              disable git writing
   -n --nomerge          create pull request, but not merge it
   -i --ignore           ignore uncommitted changes
+  -p --parallel         update and publish each repository at once
+
+./batch_publish.py  nolook_publish for many articles, each in its own git worktrees
+  -k --keys             keys to publish
+  --tags                articles having all of the tags
+  --series              articles in the series
+  -j --jobs             number of articles at once
+  -d --dry              disable git writing
+  -n --nomerge          create pull request, but not merge it
+  --keep                keep worktrees after publish
+  --list                list keys selected and exit
 
 # edit article published
 
@@ -66,6 +86,11 @@ def help_usage():
   1st                   key to checkout; 70530_publish_zenn_qiita
   -d --dry              disable changes
 
+./all_checkout.py   checkout article published for base, zenn and qiita.
+  1st                   key to checkout; 70530_publish_zenn_qiita
+  -d --dry              disable changes
+  -p --parallel         checkout base, zenn and qiita at once
+
 # edit qiita article only
 
 ./qiita_checkout.py checkout article published for zenn.
@@ -82,6 +107,12 @@ def help_usage():
 
 ./show_current.py  show current series, name, key, now
 ./show_status.py   git status for all repositories
+  --concurrent          run for all repositories at once, with summary
+  --fetch               git fetch before status, implies --concurrent
+./tag_suggest.py   suggest tags from used tags
+  -k --tags <tags>      tags of this article, suggest tags used together
+  -t --top <number>     number of tags to show, default: 10
+  --stats               show count and last used date of tags
 ./base_ls.sh       list files at base
   1st              key to list (partial is acceptable)
 ./base_editor.sh   open editor to edit files at base
@@ -89,7 +120,38 @@ def help_usage():
                    `current` to edit file for current branch
   2nd              `yaml` to edit yaml files rather than md (optional)
   3rd              editor command (optional)
+./bench_refs.py    benchmark reading refs natively against git command
+  -r --repo <path>      repository path, default: base
+  -b --branch <branch>  branch to check existence, default: current key
+  -n --number <number>  number of iterations, default: 50
+./bench_corpus.py  generate a synthetic DOC_HOME for benchmark
+  1st                   directory to create, DOC_HOME is <root>/bench
+  -a --articles <n>     number of articles, default: 100
+  -s --series <n>       number of series, default: 3
+  -k --tags <n>         number of tags, default: 50
+  -m --media <n>        number of media files per article, default: 1
+./bench_all.py     benchmark entry points on corpora, results in tmp/bench
+  -s --sizes <n> ...    numbers of articles, default: 10 100 1000 10000
+  --steps <step> ...    steps to run, default: all
+  -w --work <path>      directory for corpora, kept after run
+  --keep                keep temporary corpora
+  --real                use real gh and npx, default: fake/
+  --latency <spec>      latency of fake gh and npx, `0.5` or `gh=0.3,npx=2`
+fake/gh, fake/npx  offline stand-ins, PATH=$PWD/fake:$PATH to use them
 ./help.py          show this help message
+
+# environment
+
+ARTICLE_TRACE=1    trace commands and phases to tmp/trace_<time>.json
+ARTICLE_TRACE=<path>  trace to the path, open in chrome://tracing or Perfetto
+ARTICLE_DOC_HOME=<path>  use repositories under the path, such as a benchmark corpus
+ARTICLE_MAX_PARALLEL=<n>  commands and jobs at once in parallel modes, default: 8
+ARTICLE_USE_NPX=1  zenn/qiita init create the file by npx, rather than natively
+ARTICLE_MANIFEST=<path>  manifest of updates, tmp/update_manifest.sqlite3 by default
+                         zenn/qiita update is skipped while base, meta and article are unchanged
+ARTICLE_FAKE_STATE=<path>    state of fake gh and npx, pull requests and calls
+ARTICLE_FAKE_LATENCY=<spec>  seconds to sleep on each fake call
+ARTICLE_FAKE_BANNER=1        fake npx prints the update banner of zenn-cli
 '''
   return help
 
@@ -6,7 +6,7 @@ publish without preview current article file for base, zenn and qiita.
 copyright 2025, hanagai
 
 nolook_publish.py
-version: June 8, 2025
+version: October 18, 2026
 """
 
 import argparse
@@ -16,6 +16,18 @@ from zenn_publish import ZennPublish
 from qiita_publish import QiitaPublish
 from zenn_update import ZennUpdate
 from qiita_update import QiitaUpdate
+from common_parallel import print_results
+from common_async import run_jobs
+
+def make(cls, has_file, dry_run):
+    r"""
+    make initial or update
+    """
+    maker = cls(dry_run=dry_run, pager=False)
+    if has_file():
+        maker.make_update()
+    else:
+        maker.make_initial()
 
 
 def main():
@@ -25,6 +37,7 @@ def main():
     arg_dry = 'disable git writing (optional)'
     arg_nomerge = 'disable merging pull request (optional)'
     arg_ignore = 'ignore uncommitted changes (optional)'
+    arg_parallel = 'update and publish each repository at once (optional)'
     myself = 'nolook_publish.py'
 
     f"""
@@ -36,12 +49,14 @@ def main():
         ./{myself} --publish --dry
         ./{myself} --publish --nomerge
         ./{myself} --publish --ignore
+        ./{myself} --publish --parallel
 
     arguments:
         --publish: {arg_publish}
         -d: {arg_dry}
         -n: {arg_nomerge}
         -i: {arg_ignore}
+        -p: {arg_parallel}
     """
 
     parser = argparse.ArgumentParser(description=description)
@@ -49,6 +64,7 @@ def main():
     parser.add_argument('-d', '--dry', help=arg_dry, default=False, action='store_true')
     parser.add_argument('-n', '--nomerge', help=arg_nomerge, default=False, action='store_true')
     parser.add_argument('-i', '--ignore', help=arg_ignore, default=False, action='store_true')
+    parser.add_argument('-p', '--parallel', help=arg_parallel, default=False, action='store_true')
     args = parser.parse_args()
 
     print(args)
@@ -65,23 +81,37 @@ def main():
         print(f"current key: {conf_current.get_current('key')}")
         return
 
+    def publish(cls):
+        return cls(dry_run=args.dry, no_merge=args.nomerge, ignore_uncommitted_change=args.ignore).publish()
+
+    if args.parallel:
+        # each repository updates and publishes on its own, base is only read by others
+        def zenn():
+            make(ZennUpdate, conf_current.has_zenn_file, args.dry)
+            publish(ZennPublish)
+        def qiita():
+            make(QiitaUpdate, conf_current.has_qiita_file, args.dry)
+            publish(QiitaPublish)
+        jobs = [
+            ('base', conf_dirs.BASE, lambda: publish(BasePublish)),
+            ('zenn', conf_dirs.ZENN, zenn),
+            ('qiita', conf_dirs.QIITA, qiita),
+        ]
+        results = run_jobs(jobs)
+        print_results(results)
+        if not all(result.ok for result in results):
+            raise SystemExit(1)
+        return
+
     # Zenn, make initial or update
-    zenn_make = ZennUpdate(dry_run=args.dry, pager=False)
-    if conf_current.has_zenn_file():
-        zenn_make.make_update()
-    else:
-        zenn_make.make_initial()
+    make(ZennUpdate, conf_current.has_zenn_file, args.dry)
 
     # Qiita, make initial or update
-    qiita_make = QiitaUpdate(dry_run=args.dry, pager=False)
-    if conf_current.has_qiita_file():
-        qiita_make.make_update()
-    else:
-        qiita_make.make_initial()
+    make(QiitaUpdate, conf_current.has_qiita_file, args.dry)
 
     # publish all
     for cls in [BasePublish, ZennPublish, QiitaPublish]:
-        cls(dry_run=args.dry, no_merge=args.nomerge, ignore_uncommitted_change=args.ignore).publish()
+        publish(cls)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+keep preview servers alive, re-render articles on base edits without git.
+copyright 2026, hanagai
+
+preview_watch.py
+version: October 18, 2026
+"""
+
+import argparse
+import contextlib
+import io
+import os.path
+import subprocess
+import time
+from conf import *
+import common_trace
+import common_watch
+from zenn_update import ZennUpdate
+from qiita_update import QiitaUpdate
+
+TARGETS = {
+  'zenn': (ZennUpdate, ['npx', 'zenn', 'preview']),
+  'qiita': (QiitaUpdate, ['npx', 'qiita', 'preview']),
+}
+RESTART_WAIT = 5.0 # seconds before restarting a preview server exited
+
+class PreviewServer:
+  r"""
+  a preview server process, restarted when exited
+  """
+
+  def __init__(self, name, cwd, command):
+    self.name = name
+    self.cwd = cwd
+    self.command = command
+    self.process = None
+    self.started = None
+
+  def __str__(self):
+    return (
+      f'{self.__class__.__name__}('
+      f'{self.name},'
+      f'{self.process.pid if self.process else None},'
+      f')'
+    )
+
+  def keep_alive(self):
+    r"""
+    start the server, or restart if it exited some time ago
+    """
+    if self.process is not None and self.process.poll() is None:
+      return
+    if self.process is not None:
+      if time.monotonic() - self.started < RESTART_WAIT:
+        return
+      print(f'{self.name}: preview server exited with {self.process.returncode}, restarting.')
+    print(f'{self.name}: {" ".join(self.command)} at {self.cwd}')
+    self.started = time.monotonic()
+    try:
+      self.process = subprocess.Popen(self.command, cwd=self.cwd, stdin=subprocess.DEVNULL)
+    except OSError as e:
+      print(f'Error: {self.name}: {e}')
+      self.process = None
+
+  def stop(self):
+    if self.process is not None and self.process.poll() is None:
+      self.process.terminate()
+      try:
+        self.process.wait(timeout=5)
+      except subprocess.TimeoutExpired:
+        self.process.kill()
+
+def renderers(names):
+  r"""
+  {name: update instance} without git, of targets having the article file
+  """
+  makers = {}
+  for name in names:
+    cls, command = TARGETS[name]
+    maker = cls(no_git=True, pager=False)
+    if not os.path.exists(maker.article_path()):
+      print(f'SKIP: {name}: no article file, run {name}_init.py first. {maker.article_path()}')
+      continue
+    makers[name] = maker
+  return makers
+
+def render(name, maker, reload_meta, verbose):
+  r"""
+  re-render an article file in place, output is shown on error or verbose
+  """
+  start = time.perf_counter()
+  out = io.StringIO()
+  try:
+    with common_trace.span(f'render {name}', 'preview'), contextlib.redirect_stdout(out):
+      if reload_meta:
+        maker.current = maker.get_current()
+      maker.update_from_base()
+  except Exception as e:
+    print(out.getvalue())
+    print(f'Error: {name}: {e!r}')
+    return False
+  if verbose:
+    print(out.getvalue())
+  print(f'{name}: rendered {os.path.relpath(maker.article_path(), maker.local_path())} in {(time.perf_counter() - start) * 1000:.0f}ms')
+  return True
+
+def watch(args):
+  r"""
+  render once, then on every change until interrupted
+  """
+  makers = renderers(args.targets)
+  if len(makers) == 0:
+    print('No article to preview. Exiting.')
+    return
+  base_doc = conf_current.a_path()
+  meta_yaml = conf_current.meta_path()
+  watcher = common_watch.watcher([base_doc, meta_yaml], polling=args.polling)
+  print(f'watching {os.path.relpath(base_doc, conf_dirs.BASE)}, {os.path.relpath(meta_yaml, conf_dirs.BASE)} by {watcher.name}')
+  servers = [PreviewServer(name, maker.local_path(), TARGETS[name][1]) for name, maker in makers.items()] if args.server else []
+
+  for name, maker in makers.items():
+    render(name, maker, False, args.verbose)
+  try:
+    while True:
+      for server in servers:
+        server.keep_alive()
+      changed = common_watch.debounced(watcher, 1.0, args.debounce)
+      if not changed:
+        continue
+      reload_meta = meta_yaml in changed
+      for name, maker in makers.items():
+        render(name, maker, reload_meta, args.verbose)
+  except KeyboardInterrupt:
+    print('interrupted.')
+  finally:
+    watcher.close()
+    for server in servers:
+      server.stop()
+
+def main():
+  print('main launched manually.')
+  description = 'keep preview servers alive, re-render articles on base edits without git.'
+  arg_targets = 'platforms to preview, default: zenn qiita (optional)'
+  arg_noserver = 'only re-render, preview servers are run elsewhere (optional)'
+  arg_debounce = 'seconds without change before re-rendering (optional)'
+  arg_polling = 'poll files rather than inotify (optional)'
+  arg_verbose = 'show output of re-rendering (optional)'
+  myself = 'preview_watch.py'
+
+  f"""
+  purpose:
+    {description}
+
+  usage:
+    ./{myself}
+    ./{myself} -t zenn
+    ./{myself} --noserver --polling
+
+  arguments:
+    -t: {arg_targets}
+    --noserver: {arg_noserver}
+    --debounce: {arg_debounce}
+    --polling: {arg_polling}
+    -v: {arg_verbose}
+  """
+
+  parser = argparse.ArgumentParser(description=description)
+  parser.add_argument('-t', '--targets', help=arg_targets, nargs='+', choices=list(TARGETS), default=list(TARGETS))
+  parser.add_argument('--noserver', dest='server', help=arg_noserver, default=True, action='store_false')
+  parser.add_argument('--debounce', help=arg_debounce, default=0.15, type=float)
+  parser.add_argument('--polling', help=arg_polling, default=False, action='store_true')
+  parser.add_argument('-v', '--verbose', help=arg_verbose, default=False, action='store_true')
+  args = parser.parse_args()
+
+  print(args)
+  watch(args)
+
+if __name__ == '__main__':
+  main()
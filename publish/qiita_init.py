@@ -6,7 +6,7 @@ create and update an article file for qiita.
 copyright 2025, hanagai
 
 qiita_init.py
-version: May 29, 2025
+version: October 18, 2026
 """
 
 import argparse
@@ -20,6 +20,7 @@ def main():
   description = 'create an article file for qiita.'
   arg_dry = 'disable file writing and git (optional)'
   arg_nogit = 'disable git (optional)'
+  arg_npx = 'create the file by npx, rather than natively (optional)'
   myself = 'qiita_init.py'
 
   f"""
@@ -30,19 +31,22 @@ def main():
     ./{myself}
     ./{myself} --dry
     ./{myself} --nogit
+    ./{myself} --npx
 
   arguments:
     -d: {arg_dry}
     -n: {arg_nogit}
+    --npx: {arg_npx}
   """
 
   parser = argparse.ArgumentParser(description=description)
   parser.add_argument('-d', '--dry', help=arg_dry, default=False, action='store_true')
   parser.add_argument('-n', '--nogit', help=arg_nogit, default=False, action='store_true')
+  parser.add_argument('--npx', help=arg_npx, default=None, action='store_true')
   args = parser.parse_args()
 
   print(args)
-  QiitaUpdate(dry_run=args.dry,no_git=args.nogit).make_initial()
+  QiitaUpdate(dry_run=args.dry,no_git=args.nogit,use_npx=args.npx).make_initial()
 
 if __name__ == '__main__':
     main()
@@ -6,13 +6,32 @@ create and update an article file for qiita.
 copyright 2025, hanagai
 
 qiita_update.py
-version: May 30, 2025
+version: October 18, 2026
 """
 
 import argparse
+import os.path
 from conf import *
 from common_run import Run
 from common_update import CommonUpdate
+from common_document import ArticleDocument
+from base_git import BaseGit
+import common_transform
+
+# same as qiita-cli
+QIITA_STUB = '''---
+title: {name}
+tags:
+  - ''
+private: false
+updated_at: ''
+id: null
+organization_url_name: null
+slide: false
+ignorePublish: false
+---
+# new article body
+'''
 
 class QiitaUpdate(CommonUpdate):
     r"""
@@ -57,55 +76,58 @@ class QiitaUpdate(CommonUpdate):
         """
         return conf_current.qiita_path()
 
+    def new_stub(self, article_name):
+        r"""
+        (path relative to local repo, content) of a new article, same as npx qiita new
+        """
+        return os.path.join('public', f'{article_name}.md'), QIITA_STUB.format(name=article_name)
+
+    def transforms(self):
+        r"""
+        transforms of base md, in order
+        """
+        return [
+            common_transform.qiita_containers(),
+            common_transform.MediaLinks(BaseGit(skip_initialize=True).io_url(), conf_current.a(), conf_current.DOC),
+            common_transform.Headings(),
+        ]
+
     def command_new(self, article):
         r"""
         command to generate a new article
         """
         return ['npx', 'qiita', 'new', article]
 
-    def qiita_clean_head(self, current_head):
+    def qiita_clean_head(self, current):
         r"""
-        return head list to reuse as is for qiita
+        return FrontMatter of current head to reuse as is for qiita,
+        without title, tags and blank lines. unknown keys are kept.
         """
-        cleaned = []
-        for item in current_head:
-            if self.is_tri_hyphen(item):
-                continue
-            if self.is_h1(item):
-                continue
-            if self.is_blank(item):
-                continue
-            if self.is_yaml_array(item):
-                continue
-            if self.is_yaml_key(item, ['title', 'tags']):
-                continue
-            cleaned.append(item.rstrip())
-        print(f'current: {current_head}')
-        print(f'cleaned: {cleaned}')
-        return cleaned
-
-    def create_meta_head(self, article_path=None):
+        front = current.front_matter()
+        front.remove('title')
+        front.remove('tags')
+        front.fields = [field for field in front.fields if field[0] is not None or field[1][0].strip() != '']
+        print(f'current: {current.head_lines()}')
+        print(f'cleaned: {front.keys()}')
+        return front
+
+    def create_meta_head(self, current=None):
         r"""
         create meta information string of current article
         """
-        # assuming the article body is removed before calling this.
-        if self.dry_run:
-            print('DRY_RUN: skipping read current article head')
-            current_head = self.qiita_example_article().split('\n')
-        else:
-            with open(article_path, 'r') as file:
-                current_head = file.readlines()
-        cleaned_head = self.qiita_clean_head(current_head)
+        # current is ArticleDocument of current article, its head at least.
+        if current is None:
+            print('DRY_RUN: using example article head')
+            current = ArticleDocument.parse(self.qiita_example_article())
+        cleaned = self.qiita_clean_head(current)
         title = self.current['title']
-        tags = '\n'.join(f"  - {tag}" for tag in self.current['tags'])
-        cleaned_string = '\n'.join(cleaned_head)
-        meta = f"""---
-title: '{title}'
-tags:
-{tags}
-{cleaned_string}
----
-"""
+        tags = [f"  - {tag}\n" for tag in self.current['tags']]
+        front = conf_meta.FrontMatter([
+            ['title', [f"title: '{title}'\n"]],
+            ['tags', ['tags:\n', *tags]],
+            *cleaned.fields,
+        ], '')
+        meta = front.dump()
         print(meta)
         return meta
 
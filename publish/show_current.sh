@@ -4,13 +4,13 @@
 # copyright 2025, hanagai
 #
 # show_current.sh
-# version: May 25, 2025
+# version: October 18, 2026
 
 parent_dir=$(dirname "$(realpath "$0")")
 
-for f in `ls -1 $parent_dir/../tmp/current_*`
-do
-  echo -n "- $(basename "$f"): "
-  cat $f
-  echo ""
-done
+cd "$parent_dir"
+python3 -c '
+from conf import conf_current
+for name, value in conf_current.read_state().items():
+  print(f"- current_{name}: {value}")
+'
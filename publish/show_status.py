@@ -6,13 +6,16 @@ git status for all
 copyright 2025, hanagai
 
 show_status.py
-version: June 1, 2025
+version: October 18, 2026
 """
 
 import argparse
+import asyncio
 import os.path
+import sys
 from conf import *
 from common_run import Run
+from common_async import Scheduler
 # it doesn't depend on CommonGit
 
 def git_status_all(target, options):
@@ -22,12 +25,73 @@ def git_status_all(target, options):
     command.extend(options)
     Run.run_direct(cwd=cwd, command=command)
 
+def parse_porcelain(out):
+  r"""
+  return branch, ahead, behind, dirty from `git status --porcelain=v2 --branch`
+  ahead and behind are None without upstream
+  """
+  branch, ahead, behind, dirty = None, None, None, 0
+  for line in out.splitlines():
+    if line.startswith('# branch.head '):
+      branch = line.split(' ', 2)[2]
+    elif line.startswith('# branch.ab '):
+      _, _, plus, minus = line.split(' ')
+      ahead, behind = int(plus), -int(minus)
+    elif not line.startswith('#') and line != '':
+      dirty += 1
+  return branch, ahead, behind, dirty
+
+async def repo_status(scheduler, cwd, options, fetch):
+  r"""
+  run git (fetch and) status on a repository
+  return buffered output and summary
+  """
+  out = []
+  if fetch:
+    command = ['git', 'fetch']
+    result = await scheduler.run(cwd, command)
+    out.extend([' '.join(command), result.stdout, result.stderr])
+  color = ['-c', 'color.status=always'] if sys.stdout.isatty() else []
+  command = ['git', *color, 'status', *options]
+  result = await scheduler.run(cwd, command)
+  out.extend([' '.join(command), result.stdout, result.stderr])
+  porcelain = await scheduler.run(cwd, ['git', 'status', '--porcelain=v2', '--branch'])
+  if porcelain.returncode == 0:
+    summary = parse_porcelain(porcelain.stdout)
+  else:
+    summary = ('ERROR', None, None, None)
+  return ''.join(line if line.endswith('\n') else f'{line}\n' for line in out if line != ''), summary
+
+def git_status_concurrent(target, options, fetch=False):
+  r"""
+  run git status on all repositories at once
+  print buffered output in order of target, then summary table
+  """
+  scheduler = Scheduler()
+
+  async def status_all():
+    return await asyncio.gather(*(repo_status(scheduler, cwd, options, fetch) for cwd in target))
+
+  results = asyncio.run(status_all())
+
+  for cwd, (out, summary) in zip(target, results):
+    print(f'=== {os.path.basename(cwd)} ===')
+    print(f'at {cwd}')
+    print(out)
+
+  print(f"{'repository':24} {'branch':36} {'ahead':>5} {'behind':>6} {'dirty':>5}")
+  for cwd, (out, summary) in zip(target, results):
+    branch, ahead, behind, dirty = ['-' if value is None else value for value in summary]
+    print(f'{os.path.basename(cwd):24} {branch:36} {ahead:>5} {behind:>6} {dirty:>5}')
+
 def main():
   print('main launched manually.')
   description = "git status for all"
   arg_base = 'only for base (optional)'
   arg_zenn = 'only for zenn (optional)'
   arg_qiita = 'only for qiita (optional)'
+  arg_concurrent = 'run for all repositories at once, with summary (optional)'
+  arg_fetch = 'git fetch before status, implies --concurrent (optional)'
   myself = 'show_status.py'
 
   f"""
@@ -39,18 +103,23 @@ def main():
     ./{myself} --base
     ./{myself} --zenn
     ./{myself} --qiita
+    ./{myself} --concurrent --fetch
     ./{myself} -s -b (git status options can be used)
 
   arguments:
     --base: {arg_base}
     --zenn: {arg_zenn}
     --qiita: {arg_qiita}
+    --concurrent: {arg_concurrent}
+    --fetch: {arg_fetch}
   """
 
   parser = argparse.ArgumentParser(description=description)
   parser.add_argument('--base', help=arg_base, default=False, action='store_true')
   parser.add_argument('--zenn', help=arg_zenn, default=False, action='store_true')
   parser.add_argument('--qiita', help=arg_qiita, default=False, action='store_true')
+  parser.add_argument('--concurrent', help=arg_concurrent, default=False, action='store_true')
+  parser.add_argument('--fetch', help=arg_fetch, default=False, action='store_true')
   args, options = parser.parse_known_args()
 
   print(args)
@@ -66,7 +135,10 @@ def main():
     target = [conf_current.BASE, conf_current.ZENN, conf_current.QIITA]
 
   print(target)
-  git_status_all(target, options)
+  if args.concurrent or args.fetch:
+    git_status_concurrent(target, options, fetch=args.fetch)
+  else:
+    git_status_all(target, options)
 
 if __name__ == '__main__':
     main()
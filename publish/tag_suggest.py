@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+r"""
+article publishing tools:
+suggest tags from used tags
+copyright 2026, hanagai
+
+tag_suggest.py
+version: October 18, 2026
+"""
+
+import argparse
+from conf import *
+
+def show_suggest(tags, top):
+  r"""
+  show tags suggested for tags
+  """
+  stats = conf_current.tag_stats()
+  suggested = stats.suggest(tags, top)
+  print(' '.join(suggested))
+
+def show_stats(top):
+  r"""
+  show count and last used date of tags
+  """
+  stats = conf_current.tag_stats()
+  for tag, count, last_now in stats.counts(top):
+    if last_now is None:
+      last_used = '-'
+    else:
+      last_used = f'{last_now} ({conf_current.reiwa_day_ago(str(last_now))} days ago)'
+    print(f'{count:6} {tag:30} {last_used}')
+
+def main():
+  print('main launched manually.')
+  description = 'suggest tags from used tags'
+  arg_tags = 'tags of this article, delimited by space (optional)'
+  arg_top = 'number of tags to show (optional)'
+  arg_stats = 'show count and last used date of tags (optional)'
+  myself = 'tag_suggest.py'
+
+  f"""
+  purpose:
+    {description}
+
+  usage:
+    ./{myself}
+    ./{myself} -k 'Android Activity'
+    ./{myself} --stats -t 30
+
+  arguments:
+    -k: {arg_tags}
+    -t: {arg_top}
+    --stats: {arg_stats}
+  """
+
+  parser = argparse.ArgumentParser(description=description)
+  parser.add_argument('-k', '--tags', help=arg_tags, default='')
+  parser.add_argument('-t', '--top', help=arg_top, default=10, type=int)
+  parser.add_argument('--stats', help=arg_stats, default=False, action='store_true')
+  args = parser.parse_args()
+
+  print(args)
+  if args.stats:
+    show_stats(args.top)
+  else:
+    show_suggest(args.tags.split(), args.top)
+
+if __name__ == '__main__':
+  main()
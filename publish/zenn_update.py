@@ -6,13 +6,30 @@ create and update an article file for zenn.
 copyright 2025, hanagai
 
 zenn_update.py
-version: May 28, 2025
+version: October 18, 2026
 """
 
 import argparse
+import os.path
+import random
+import re
 from conf import *
 from common_run import Run
 from common_update import CommonUpdate
+from base_git import BaseGit
+import common_transform
+
+# same as zenn-cli
+ZENN_SLUG = re.compile(r'^[a-z0-9_-]{12,50}$')
+ZENN_EMOJIS = ['😺', '📘', '📚', '📑', '😊', '😎', '👻', '🤖', '😸', '😽', '💨', '💬', '💭', '👋', '👌', '👏', '🙌', '🙆', '🐕', '🐈', '🦁', '🐷', '🦔', '🐥', '🐡', '🐙', '🍣', '🕌', '🌟', '🔥', '🌊', '🎃', '✨', '🎉', '⛳', '🔖', '📝', '🗂', '📌']
+ZENN_STUB = '''---
+title: ""
+emoji: "{emoji}"
+type: "tech" # tech: 技術記事 / idea: アイデア
+topics: []
+published: false
+---
+'''
 
 class ZennUpdate(CommonUpdate):
     r"""
@@ -57,28 +74,56 @@ class ZennUpdate(CommonUpdate):
         """
         return conf_current.zenn_path()
 
+    def new_stub(self, article_name):
+        r"""
+        (path relative to local repo, content) of a new article, same as npx zenn new:article
+        """
+        return os.path.join('articles', f'{article_name}.md'), ZENN_STUB.format(emoji=random.choice(ZENN_EMOJIS))
+
+    def validate_new_name(self, article_name):
+        r"""
+        raise ValueError if the slug is not allowed by zenn
+        """
+        if not ZENN_SLUG.match(article_name):
+            message = f'Error: slugの値（{article_name}）が不正です。小文字の半角英数字（a-z0-9）、ハイフン（-）、アンダースコア（_）の12〜50字の組み合わせにしてください'
+            print(message)
+            raise ValueError(message)
+
+    def transforms(self):
+        r"""
+        transforms of base md, in order
+        """
+        return [
+            common_transform.zenn_containers(),
+            common_transform.MediaLinks(BaseGit(skip_initialize=True).io_url(), conf_current.a(), conf_current.DOC),
+            common_transform.Headings(),
+        ]
+
     def command_new(self, article):
         r"""
         command to generate a new article
         """
         return ['npx', 'zenn', 'new:article', '--slug', article]
 
-    def create_meta_head(self, article_path=None):
+    def create_meta_head(self, current=None):
         r"""
         create meta information string of current article
+        keys not set here, such as published_at, are kept from current article
         """
+        # current is ArticleDocument of current article, None on dry run
+        front = current.front_matter() if current is not None else None
+        if front is None:
+            front = conf_meta.parse_front_matter('---\n---\n')
         title = self.current['title']
         tech = self.current['type']
         emoji = self.current['emoji']
         topics = '["' + '", "'.join(self.current['tags']) + '"]'
-        meta = f'''---
-title: "{title}"
-topics: {topics}
-type: "{tech}"
-emoji: "{emoji}"
-published: true
----
-'''
+        front.set_lines('title', [f'title: "{title}"\n'])
+        front.set_lines('topics', [f'topics: {topics}\n'])
+        front.set_lines('type', [f'type: "{tech}"\n'])
+        front.set_lines('emoji', [f'emoji: "{emoji}"\n'])
+        front.set_lines('published', ['published: true\n'])
+        meta = front.dump()
         print(meta)
         return meta
 